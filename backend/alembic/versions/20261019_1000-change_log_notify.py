@@ -0,0 +1,47 @@
+"""notify listeners on change log insert
+
+Revision ID: change_log_notify_002
+Revises: initial_rev_001
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'change_log_notify_002'
+down_revision: Union[str, None] = 'initial_rev_001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # NOTIFY is delivered on commit, so listeners only ever see committed rows
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_change_log_inserted() RETURNS trigger AS $$
+        DECLARE
+            defect_row RECORD;
+        BEGIN
+            SELECT project_id, assignee_id INTO defect_row FROM defects WHERE id = NEW.defect_id;
+            PERFORM pg_notify('change_logs', json_build_object(
+                'id', NEW.id,
+                'project_id', defect_row.project_id,
+                'assignee_id', defect_row.assignee_id
+            )::text);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER change_logs_notify
+        AFTER INSERT ON change_logs
+        FOR EACH ROW EXECUTE FUNCTION notify_change_log_inserted();
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS change_logs_notify ON change_logs")
+    op.execute("DROP FUNCTION IF EXISTS notify_change_log_inserted()")
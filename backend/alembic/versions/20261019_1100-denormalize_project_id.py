@@ -0,0 +1,83 @@
+"""denormalize project_id on change_logs and comments
+
+Revision ID: denormalize_project_id_003
+Revises: change_log_notify_002
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'denormalize_project_id_003'
+down_revision: Union[str, None] = 'change_log_notify_002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows updated per backfill transaction
+BACKFILL_BATCH_SIZE = 5000
+
+TABLES = ('change_logs', 'comments')
+
+
+def _backfill(table: str) -> None:
+    """Copy project_id from defects in small committed batches."""
+    connection = op.get_bind()
+    while True:
+        result = connection.execute(sa.text(f"""
+            UPDATE {table} AS t
+            SET project_id = d.project_id
+            FROM defects AS d
+            WHERE d.id = t.defect_id
+              AND t.id IN (
+                  SELECT id FROM {table}
+                  WHERE project_id IS NULL
+                  LIMIT :batch_size
+              )
+        """), {"batch_size": BACKFILL_BATCH_SIZE})
+        if result.rowcount == 0:
+            break
+
+
+def upgrade() -> None:
+    # Every step runs in its own transaction so the tables are never locked for long
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.add_column(table, sa.Column('project_id', sa.Integer(), nullable=True))
+            op.execute(f"""
+                ALTER TABLE {table}
+                ADD CONSTRAINT {table}_project_id_fkey
+                FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE
+                NOT VALID
+            """)
+            op.create_index(
+                f'ix_{table}_project_id_created_at',
+                table,
+                ['project_id', sa.text('created_at DESC')],
+                unique=False,
+                postgresql_concurrently=True
+            )
+
+            _backfill(table)
+
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_project_id_fkey")
+
+            # A validated CHECK lets SET NOT NULL skip its full-table scan
+            op.execute(f"""
+                ALTER TABLE {table}
+                ADD CONSTRAINT {table}_project_id_not_null CHECK (project_id IS NOT NULL)
+                NOT VALID
+            """)
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_project_id_not_null")
+            op.alter_column(table, 'project_id', nullable=False)
+            op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {table}_project_id_not_null")
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_index(f'ix_{table}_project_id_created_at', table_name=table)
+        op.drop_constraint(f'{table}_project_id_fkey', table, type_='foreignkey')
+        op.drop_column(table, 'project_id')
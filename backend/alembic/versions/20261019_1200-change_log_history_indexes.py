@@ -0,0 +1,57 @@
+"""keyset pagination indexes for change log history
+
+Revision ID: change_log_history_indexes_004
+Revises: denormalize_project_id_003
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'change_log_history_indexes_004'
+down_revision: Union[str, None] = 'denormalize_project_id_003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_index(name: str, columns: list) -> None:
+    op.create_index(
+        name,
+        'change_logs',
+        columns,
+        unique=False,
+        postgresql_concurrently=True
+    )
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Rebuild the project feed index with id as a tie-breaker for (created_at, id) cursors
+        _create_index('ix_change_logs_project_id_created_at_id', [
+            'project_id', sa.text('created_at DESC'), sa.text('id DESC')
+        ])
+        op.drop_index('ix_change_logs_project_id_created_at', table_name='change_logs', postgresql_concurrently=True)
+        op.execute("ALTER INDEX ix_change_logs_project_id_created_at_id RENAME TO ix_change_logs_project_id_created_at")
+
+        _create_index('ix_change_logs_project_id_user_id_created_at', [
+            'project_id', 'user_id', sa.text('created_at DESC'), sa.text('id DESC')
+        ])
+        _create_index('ix_change_logs_project_id_change_type_created_at', [
+            'project_id', 'change_type', sa.text('created_at DESC'), sa.text('id DESC')
+        ])
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_change_logs_project_id_change_type_created_at', table_name='change_logs', postgresql_concurrently=True)
+        op.drop_index('ix_change_logs_project_id_user_id_created_at', table_name='change_logs', postgresql_concurrently=True)
+
+        _create_index('ix_change_logs_project_id_created_at_old', [
+            'project_id', sa.text('created_at DESC')
+        ])
+        op.drop_index('ix_change_logs_project_id_created_at', table_name='change_logs', postgresql_concurrently=True)
+        op.execute("ALTER INDEX ix_change_logs_project_id_created_at_old RENAME TO ix_change_logs_project_id_created_at")
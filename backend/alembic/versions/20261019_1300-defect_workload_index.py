@@ -0,0 +1,38 @@
+"""defect workload index
+
+Revision ID: defect_workload_index_005
+Revises: change_log_history_indexes_004
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'defect_workload_index_005'
+down_revision: Union[str, None] = 'change_log_history_indexes_004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_defects_project_id_assignee_id_status_id',
+            'defects',
+            ['project_id', 'assignee_id', 'status_id'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_defects_project_id_assignee_id_status_id',
+            table_name='defects',
+            postgresql_concurrently=True
+        )
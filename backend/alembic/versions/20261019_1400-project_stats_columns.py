@@ -0,0 +1,46 @@
+"""denormalized statistics columns on projects
+
+Revision ID: project_stats_columns_006
+Revises: defect_workload_index_005
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'project_stats_columns_006'
+down_revision: Union[str, None] = 'defect_workload_index_005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('projects', sa.Column('defects_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('projects', sa.Column('team_size', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('projects', sa.Column('last_defect_date', sa.DateTime(timezone=True), nullable=True))
+
+    op.execute("""
+        UPDATE projects AS p
+        SET defects_count = (
+                SELECT count(*) FROM defects AS d WHERE d.project_id = p.id
+            ),
+            last_defect_date = (
+                SELECT max(d.created_at) FROM defects AS d WHERE d.project_id = p.id
+            ),
+            team_size = (
+                SELECT count(DISTINCT ur.user_id)
+                FROM user_roles AS ur
+                JOIN users AS u ON u.id = ur.user_id
+                WHERE ur.project_id = p.id AND u.is_superuser = false
+            )
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('projects', 'last_defect_date')
+    op.drop_column('projects', 'team_size')
+    op.drop_column('projects', 'defects_count')
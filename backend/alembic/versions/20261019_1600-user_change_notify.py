@@ -0,0 +1,44 @@
+"""notify listeners on user update and delete
+
+Revision ID: user_change_notify_008
+Revises: user_search_indexes_007
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'user_change_notify_008'
+down_revision: Union[str, None] = 'user_search_indexes_007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Logins only touch last_login; skipping them keeps logins from flushing every worker's cache
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_user_changed() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE'
+               AND to_jsonb(NEW) - 'last_login' = to_jsonb(OLD) - 'last_login' THEN
+                RETURN NEW;
+            END IF;
+            PERFORM pg_notify('users', OLD.id::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER users_notify
+        AFTER UPDATE OR DELETE ON users
+        FOR EACH ROW EXECUTE FUNCTION notify_user_changed();
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS users_notify ON users")
+    op.execute("DROP FUNCTION IF EXISTS notify_user_changed()")
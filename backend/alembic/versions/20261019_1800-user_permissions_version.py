@@ -0,0 +1,48 @@
+"""user permissions version
+
+Revision ID: user_permissions_version_010
+Revises: revoked_tokens_009
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'user_permissions_version_010'
+down_revision: Union[str, None] = 'revoked_tokens_009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('permissions_version', sa.Integer(), server_default='0', nullable=False))
+
+    # Any role change, including bulk deletes, outdates the role claims in the user's tokens
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_user_permissions_version() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE users SET permissions_version = permissions_version + 1 WHERE id = OLD.user_id;
+            END IF;
+            IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.user_id <> OLD.user_id) THEN
+                UPDATE users SET permissions_version = permissions_version + 1 WHERE id = NEW.user_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER user_roles_bump_permissions_version
+        AFTER INSERT OR UPDATE OR DELETE ON user_roles
+        FOR EACH ROW EXECUTE FUNCTION bump_user_permissions_version();
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS user_roles_bump_permissions_version ON user_roles")
+    op.execute("DROP FUNCTION IF EXISTS bump_user_permissions_version()")
+    op.drop_column('users', 'permissions_version')
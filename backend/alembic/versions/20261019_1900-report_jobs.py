@@ -0,0 +1,52 @@
+"""report jobs
+
+Revision ID: report_jobs_011
+Revises: user_permissions_version_010
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'report_jobs_011'
+down_revision: Union[str, None] = 'user_permissions_version_010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'report_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_by', sa.Integer(), nullable=False),
+        sa.Column('params', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(length=20), server_default='queued', nullable=False),
+        sa.Column('progress', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('report_id', sa.Integer(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.CheckConstraint("status IN ('queued', 'running', 'completed', 'failed')", name='report_job_status_check'),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['report_id'], ['reports.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_report_jobs_id'), 'report_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_report_jobs_created_by'), 'report_jobs', ['created_by'], unique=False)
+    # Workers claim the oldest queued job
+    op.create_index(
+        'ix_report_jobs_queued', 'report_jobs', ['id'],
+        unique=False, postgresql_where=sa.text("status = 'queued'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_report_jobs_queued', table_name='report_jobs')
+    op.drop_index(op.f('ix_report_jobs_created_by'), table_name='report_jobs')
+    op.drop_index(op.f('ix_report_jobs_id'), table_name='report_jobs')
+    op.drop_table('report_jobs')
@@ -0,0 +1,70 @@
+"""report artifacts
+
+Revision ID: report_artifacts_012
+Revises: report_jobs_011
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'report_artifacts_012'
+down_revision: Union[str, None] = 'report_jobs_011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'report_artifacts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('format', sa.String(length=20), nullable=False),
+        sa.Column('file_path', sa.String(length=500), nullable=False),
+        sa.Column('file_size', sa.Integer(), nullable=True),
+        sa.Column('ref_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('cache_key')
+    )
+    op.create_index(op.f('ix_report_artifacts_id'), 'report_artifacts', ['id'], unique=False)
+
+    op.add_column('reports', sa.Column('artifact_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'reports_artifact_id_fkey', 'reports', 'report_artifacts', ['artifact_id'], ['id']
+    )
+    op.create_index(op.f('ix_reports_artifact_id'), 'reports', ['artifact_id'], unique=False)
+
+    # Reports are also deleted by cascades from projects, so references are counted in the database
+    op.execute("""
+        CREATE OR REPLACE FUNCTION count_report_artifact_refs() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.artifact_id IS NOT NULL THEN
+                UPDATE report_artifacts SET ref_count = ref_count - 1 WHERE id = OLD.artifact_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.artifact_id IS NOT NULL THEN
+                UPDATE report_artifacts SET ref_count = ref_count + 1 WHERE id = NEW.artifact_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER reports_count_artifact_refs
+        AFTER INSERT OR DELETE OR UPDATE OF artifact_id ON reports
+        FOR EACH ROW EXECUTE FUNCTION count_report_artifact_refs();
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS reports_count_artifact_refs ON reports")
+    op.execute("DROP FUNCTION IF EXISTS count_report_artifact_refs()")
+    op.drop_index(op.f('ix_reports_artifact_id'), table_name='reports')
+    op.drop_constraint('reports_artifact_id_fkey', 'reports', type_='foreignkey')
+    op.drop_column('reports', 'artifact_id')
+    op.drop_index(op.f('ix_report_artifacts_id'), table_name='report_artifacts')
+    op.drop_table('report_artifacts')
@@ -0,0 +1,30 @@
+"""report project_ids gin index
+
+Revision ID: report_project_ids_gin_013
+Revises: report_artifacts_012
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'report_project_ids_gin_013'
+down_revision: Union[str, None] = 'report_artifacts_012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Report listings filter with project_ids <@ and @> array containment
+    op.create_index(
+        'ix_reports_project_ids', 'reports', ['project_ids'],
+        unique=False, postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reports_project_ids', table_name='reports')
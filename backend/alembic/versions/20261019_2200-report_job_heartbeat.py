@@ -0,0 +1,28 @@
+"""report job heartbeat
+
+Revision ID: report_job_heartbeat_014
+Revises: report_project_ids_gin_013
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'report_job_heartbeat_014'
+down_revision: Union[str, None] = 'report_project_ids_gin_013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('report_jobs', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+    # Jobs running before the upgrade get a lease from their start time
+    op.execute("UPDATE report_jobs SET heartbeat_at = started_at WHERE status = 'running'")
+
+
+def downgrade() -> None:
+    op.drop_column('report_jobs', 'heartbeat_at')
@@ -0,0 +1,51 @@
+"""notify listeners on defect and comment writes
+
+Revision ID: dashboard_change_notify_015
+Revises: report_job_heartbeat_014
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dashboard_change_notify_015'
+down_revision: Union[str, None] = 'report_job_heartbeat_014'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # PostgreSQL folds identical notifications of a transaction, so bulk writes send one per project
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_dashboard_changed() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                PERFORM pg_notify('dashboard', OLD.project_id::text);
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                PERFORM pg_notify('dashboard', NEW.project_id::text);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER defects_notify_dashboard
+        AFTER INSERT OR UPDATE OR DELETE ON defects
+        FOR EACH ROW EXECUTE FUNCTION notify_dashboard_changed();
+    """)
+    op.execute("""
+        CREATE TRIGGER comments_notify_dashboard
+        AFTER INSERT OR UPDATE OR DELETE ON comments
+        FOR EACH ROW EXECUTE FUNCTION notify_dashboard_changed();
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS comments_notify_dashboard ON comments")
+    op.execute("DROP TRIGGER IF EXISTS defects_notify_dashboard ON defects")
+    op.execute("DROP FUNCTION IF EXISTS notify_dashboard_changed()")
@@ -0,0 +1,67 @@
+"""project data version
+
+Revision ID: project_data_version_016
+Revises: dashboard_change_notify_015
+Create Date: 2026-10-19 23:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'project_data_version_016'
+down_revision: Union[str, None] = 'dashboard_change_notify_015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('projects', sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+
+    # The bump locks the project row until commit, so versions follow commit order
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_project_data_version() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE projects SET data_version = data_version + 1 WHERE id = OLD.project_id;
+            END IF;
+            IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.project_id <> OLD.project_id) THEN
+                UPDATE projects SET data_version = data_version + 1 WHERE id = NEW.project_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER defects_bump_project_data_version
+        AFTER INSERT OR UPDATE OR DELETE ON defects
+        FOR EACH ROW EXECUTE FUNCTION bump_project_data_version();
+    """)
+
+    # Project names are printed in reports
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_renamed_project_data_version() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.name IS DISTINCT FROM OLD.name THEN
+                NEW.data_version := OLD.data_version + 1;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER projects_bump_data_version
+        BEFORE UPDATE ON projects
+        FOR EACH ROW EXECUTE FUNCTION bump_renamed_project_data_version();
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS projects_bump_data_version ON projects")
+    op.execute("DROP FUNCTION IF EXISTS bump_renamed_project_data_version()")
+    op.execute("DROP TRIGGER IF EXISTS defects_bump_project_data_version ON defects")
+    op.execute("DROP FUNCTION IF EXISTS bump_project_data_version()")
+    op.drop_column('projects', 'data_version')
@@ -0,0 +1,70 @@
+"""commit-ordered change log sequence per project
+
+Revision ID: change_log_project_seq_017
+Revises: project_data_version_016
+Create Date: 2026-10-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'change_log_project_seq_017'
+down_revision: Union[str, None] = 'project_data_version_016'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('projects', sa.Column('change_log_seq', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('change_logs', sa.Column('project_seq', sa.Integer(), nullable=True))
+
+    op.execute("""
+        UPDATE change_logs SET project_seq = numbered.seq
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY project_id ORDER BY id) AS seq
+            FROM change_logs
+        ) AS numbered
+        WHERE change_logs.id = numbered.id
+    """)
+    op.execute("""
+        UPDATE projects SET change_log_seq = latest.seq
+        FROM (
+            SELECT project_id, max(project_seq) AS seq FROM change_logs GROUP BY project_id
+        ) AS latest
+        WHERE projects.id = latest.project_id
+    """)
+
+    op.alter_column('change_logs', 'project_seq', nullable=False)
+    op.create_index(
+        'ix_change_logs_project_id_project_seq', 'change_logs', ['project_id', 'project_seq'], unique=True
+    )
+
+    # Ids are taken at insert time, so a later id can commit first. The
+    # project row stays locked until commit, so these numbers follow commit order.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION assign_change_log_project_seq() RETURNS trigger AS $$
+        BEGIN
+            UPDATE projects SET change_log_seq = change_log_seq + 1
+            WHERE id = NEW.project_id
+            RETURNING change_log_seq INTO NEW.project_seq;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER change_logs_assign_project_seq
+        BEFORE INSERT ON change_logs
+        FOR EACH ROW EXECUTE FUNCTION assign_change_log_project_seq();
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS change_logs_assign_project_seq ON change_logs")
+    op.execute("DROP FUNCTION IF EXISTS assign_change_log_project_seq()")
+    op.drop_index('ix_change_logs_project_id_project_seq', table_name='change_logs')
+    op.drop_column('change_logs', 'project_seq')
+    op.drop_column('projects', 'change_log_seq')
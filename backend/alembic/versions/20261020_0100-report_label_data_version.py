@@ -0,0 +1,82 @@
+"""bump project data versions on renamed users, statuses and priorities
+
+Revision ID: report_label_data_version_018
+Revises: change_log_project_seq_017
+Create Date: 2026-10-20 01:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'report_label_data_version_018'
+down_revision: Union[str, None] = 'change_log_project_seq_017'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Reports print assignee names and status and priority labels, so renaming
+    # any of them outdates the reports of every project whose defects use it
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_assignee_project_data_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE projects SET data_version = data_version + 1
+            WHERE id IN (SELECT project_id FROM defects WHERE assignee_id = NEW.id);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER users_bump_project_data_version
+        AFTER UPDATE OF first_name, last_name ON users
+        FOR EACH ROW
+        WHEN (NEW.first_name IS DISTINCT FROM OLD.first_name OR NEW.last_name IS DISTINCT FROM OLD.last_name)
+        EXECUTE FUNCTION bump_assignee_project_data_version();
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_status_project_data_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE projects SET data_version = data_version + 1
+            WHERE id IN (SELECT project_id FROM defects WHERE status_id = NEW.id);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER defect_statuses_bump_project_data_version
+        AFTER UPDATE OF display_name ON defect_statuses
+        FOR EACH ROW
+        WHEN (NEW.display_name IS DISTINCT FROM OLD.display_name)
+        EXECUTE FUNCTION bump_status_project_data_version();
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_priority_project_data_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE projects SET data_version = data_version + 1
+            WHERE id IN (SELECT project_id FROM defects WHERE priority_id = NEW.id);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER priorities_bump_project_data_version
+        AFTER UPDATE OF display_name ON priorities
+        FOR EACH ROW
+        WHEN (NEW.display_name IS DISTINCT FROM OLD.display_name)
+        EXECUTE FUNCTION bump_priority_project_data_version();
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS priorities_bump_project_data_version ON priorities")
+    op.execute("DROP FUNCTION IF EXISTS bump_priority_project_data_version()")
+    op.execute("DROP TRIGGER IF EXISTS defect_statuses_bump_project_data_version ON defect_statuses")
+    op.execute("DROP FUNCTION IF EXISTS bump_status_project_data_version()")
+    op.execute("DROP TRIGGER IF EXISTS users_bump_project_data_version ON users")
+    op.execute("DROP FUNCTION IF EXISTS bump_assignee_project_data_version()")
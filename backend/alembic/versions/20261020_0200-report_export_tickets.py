@@ -0,0 +1,36 @@
+"""report export tickets
+
+Revision ID: report_export_tickets_019
+Revises: report_label_data_version_018
+Create Date: 2026-10-20 02:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'report_export_tickets_019'
+down_revision: Union[str, None] = 'report_label_data_version_018'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'report_export_tickets',
+        sa.Column('token_hash', sa.String(length=64), nullable=False),
+        sa.Column('created_by', sa.Integer(), nullable=False),
+        sa.Column('params', sa.JSON(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('token_hash')
+    )
+    op.create_index(op.f('ix_report_export_tickets_expires_at'), 'report_export_tickets', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_report_export_tickets_expires_at'), table_name='report_export_tickets')
+    op.drop_table('report_export_tickets')
@@ -0,0 +1,35 @@
+"""change log index for engineers' history pages
+
+Revision ID: change_log_defect_history_index_020
+Revises: report_export_tickets_019
+Create Date: 2026-10-20 03:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'change_log_defect_history_index_020'
+down_revision: Union[str, None] = 'report_export_tickets_019'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Engineers page through the history of their assigned defects only
+        op.create_index(
+            'ix_change_logs_defect_id_created_at',
+            'change_logs',
+            ['defect_id', sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_change_logs_defect_id_created_at', table_name='change_logs', postgresql_concurrently=True)
@@ -1,7 +1,9 @@
 """Authentication endpoints."""
 
-from datetime import timedelta
+from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
 from app.db import get_db
@@ -14,24 +16,29 @@ from app.schemas.auth import (
     Token
 )
 from app.core.security import (
-    verify_password,
-    get_password_hash,
-    create_access_token
+    password_hasher,
+    password_needs_rehash,
+    PasswordHasherBusy,
+    create_access_token,
+    decode_access_token
 )
-from app.core.deps import get_current_user
+from app.core.deps import get_current_user, get_token_role_claims, security
+from app.core.token_revocation import revoked_tokens
 from app.core.config import settings
 
 router = APIRouter()
 
 
 @router.post("/register", response_model=LoginResponse, status_code=status.HTTP_201_CREATED)
-def register(
+async def register(
     user_data: RegisterRequest,
     db: Session = Depends(get_db)
 ):
     """Register a new user."""
     # Check if username already exists
-    existing_user = db.query(User).filter(User.username == user_data.username).first()
+    existing_user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.username == user_data.username).first()
+    )
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -39,7 +46,9 @@ def register(
         )
     
     # Check if email already exists
-    existing_email = db.query(User).filter(User.email == user_data.email).first()
+    existing_email = await run_in_threadpool(
+        lambda: db.query(User).filter(User.email == user_data.email).first()
+    )
     if existing_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -47,7 +56,7 @@ def register(
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await _run_password_job(password_hasher.hash(user_data.password))
     
     db_user = User(
         username=user_data.username,
@@ -58,16 +67,13 @@ def register(
         is_active=True
     )
     
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    def save():
+        db.add(db_user)
+        db.commit()
+        db.refresh(db_user)
+        return _create_user_token(db_user, db)
     
-    # Create access token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(db_user.id)},
-        expires_delta=access_token_expires
-    )
+    access_token = await run_in_threadpool(save)
     
     # Return token and user data
     return LoginResponse(
@@ -78,13 +84,15 @@ def register(
 
 
 @router.post("/login", response_model=LoginResponse)
-def login(
+async def login(
     credentials: LoginRequest,
     db: Session = Depends(get_db)
 ):
     """Authenticate user and return JWT token."""
     # Find user by username
-    user = db.query(User).filter(User.username == credentials.username).first()
+    user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.username == credentials.username).first()
+    )
     
     if not user:
         raise HTTPException(
@@ -94,7 +102,7 @@ def login(
         )
     
     # Verify password
-    if not verify_password(credentials.password, user.password_hash):
+    if not await _run_password_job(password_hasher.verify(credentials.password, user.password_hash)):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -108,26 +116,41 @@ def login(
             detail="Inactive user"
         )
     
-    # Create access token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(user.id)},
-        expires_delta=access_token_expires
-    )
+    # Upgrade hashes made with an outdated bcrypt cost while the password is at hand
+    if password_needs_rehash(user.password_hash):
+        try:
+            user.password_hash = await password_hasher.hash(credentials.password)
+        except PasswordHasherBusy:
+            pass
+    
+    # Update last login and create access token
+    def save():
+        user.last_login = datetime.utcnow()
+        db.commit()
+        return _create_user_token(user, db), UserResponse.model_validate(user)
     
-    # Update last login
-    from datetime import datetime
-    user.last_login = datetime.utcnow()
-    db.commit()
+    access_token, user_response = await run_in_threadpool(save)
     
     # Return token and user data
     return LoginResponse(
         access_token=access_token,
         token_type="bearer",
-        user=UserResponse.model_validate(user)
+        user=user_response
     )
 
 
+async def _run_password_job(job):
+    """Await a password hashing job, answering 503 when the hasher is saturated."""
+    try:
+        return await job
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in attempts in progress, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+
 @router.get("/me", response_model=UserResponse)
 def get_current_user_info(
     current_user: User = Depends(get_current_user)
@@ -138,23 +161,38 @@ def get_current_user_info(
 
 @router.post("/logout")
 def logout(
-    current_user: User = Depends(get_current_user)
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
-    """Logout endpoint (client should remove token)."""
-    # Since we're using JWT, logout is handled client-side by removing the token
-    # This endpoint exists for consistency and can be extended for token blacklisting
+    """Logout: revoke the token used for this request."""
+    payload = decode_access_token(credentials.credentials)
+    
+    # Tokens issued before revocation support carry no jti and simply expire
+    if payload and payload.get("jti") and payload.get("exp"):
+        revoked_tokens.revoke(db, payload["jti"], current_user.id, payload["exp"])
+    
     return {"message": "Successfully logged out"}
 
 
 @router.post("/refresh", response_model=Token)
 def refresh_token(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
-    """Refresh access token."""
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": current_user.id},
-        expires_delta=access_token_expires
-    )
+    """Refresh access token, picking up any changes to the user's roles."""
+    # Roles in the old token may be outdated, so take them from the database
+    db.info.pop("project_role_resolvers", None)
+    access_token = _create_user_token(current_user, db)
     
     return Token(access_token=access_token, token_type="bearer")
+
+
+def _create_user_token(user: User, db: Session) -> str:
+    """Create an access token for a user, embedding role claims if enabled."""
+    data = {"sub": str(user.id)}
+    if settings.TOKEN_ROLE_CLAIMS:
+        data.update(get_token_role_claims(user, db))
+    
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return create_access_token(data=data, expires_delta=access_token_expires)
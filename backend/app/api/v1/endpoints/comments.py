@@ -80,12 +80,13 @@ def create_comment(
         )
     
     try:
-        db_comment = Comment(**comment_in.model_dump())
+        db_comment = Comment(**comment_in.model_dump(), project_id=defect.project_id)
         db.add(db_comment)
         db.flush()
         
         change_log = ChangeLog(
             defect_id=comment_in.defect_id,
+            project_id=defect.project_id,
             user_id=comment_in.author_id,
             field_name="comment",
             new_value=f"Comment {db_comment.id}",
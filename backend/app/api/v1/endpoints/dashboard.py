@@ -1,21 +1,188 @@
 """Dashboard endpoints."""
 
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
+import base64
+import json
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Header
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case, and_, or_
-from datetime import date
+from sqlalchemy import func, case, and_, or_, tuple_, literal
+from datetime import date, datetime, timedelta
 
-from app.db import get_db
+from app.db import get_db, SessionLocal
 from app.models.defect import Defect, DefectStatus, Priority
 from app.models.change_log import ChangeLog
 from app.models.user import User
 from app.models.project import Project
 from app.models.role import UserRole, Role
 from app.core.deps import get_current_user, get_user_role_in_project
+from app.core.permissions import Permission, has_permission
+from app.core.activity_stream import activity_stream
+from app.core.analytics import compute_project_analytics, analytics_cache
+from app.core.cache import TTLCache
+from app.core.dashboard_cache import dashboard_cache
 
 router = APIRouter()
 
+# Idle interval after which a comment line is sent to keep the stream open
+STREAM_HEARTBEAT_SECONDS = 15
+
+# Maximum number of actions read per stream wake-up
+STREAM_BATCH_SIZE = 100
+
+CHANGE_TYPES = ['create', 'update', 'delete', 'status_change', 'comment']
+
+# Workload changes with every assignment, so it is only cached briefly
+workload_cache = TTLCache(maxsize=1024, ttl=30)
+
+
+@router.get("/cache-stats")
+def get_cache_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Get dashboard cache hit/miss statistics. Superusers only."""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only administrators can view cache statistics"
+        )
+    
+    return dashboard_cache.stats()
+
+
+@router.get("/portfolio")
+def get_portfolio(
+    top: int = Query(2, ge=1, le=10),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get metrics and critical defects for all of the user's projects at once.
+    
+    Engineers only see their assigned defects in projects where they are engineers.
+    """
+    if current_user.is_superuser:
+        memberships = db.query(
+            Project.id,
+            Project.name,
+            literal(False).label('is_engineer')
+        ).order_by(Project.name).all()
+    else:
+        memberships = db.query(
+            Project.id,
+            Project.name,
+            func.bool_and(Role.name == 'engineer').label('is_engineer')
+        ).join(
+            UserRole, UserRole.project_id == Project.id
+        ).join(
+            Role, UserRole.role_id == Role.id
+        ).filter(
+            UserRole.user_id == current_user.id
+        ).group_by(
+            Project.id
+        ).order_by(Project.name).all()
+    
+    if not memberships:
+        return []
+    
+    project_ids = [m.id for m in memberships]
+    engineer_project_ids = [m.id for m in memberships if m.is_engineer]
+    
+    visible = and_(
+        Defect.project_id.in_(project_ids),
+        or_(
+            Defect.project_id.notin_(engineer_project_ids),
+            Defect.assignee_id == current_user.id
+        )
+    )
+    
+    metrics_rows = db.query(
+        Defect.project_id,
+        func.count(Defect.id).filter(DefectStatus.name != 'closed').label('total_defects'),
+        func.count(Defect.id).filter(DefectStatus.name == 'in_progress').label('in_progress'),
+        func.count(Defect.id).filter(
+            Defect.due_date < date.today(),
+            DefectStatus.is_final == False
+        ).label('overdue')
+    ).join(
+        DefectStatus, Defect.status_id == DefectStatus.id
+    ).filter(
+        visible
+    ).group_by(
+        Defect.project_id
+    ).all()
+    
+    metrics = {row.project_id: row for row in metrics_rows}
+    
+    ranked = db.query(
+        Defect.id.label('defect_id'),
+        Defect.project_id,
+        Defect.title,
+        Defect.location,
+        Defect.assignee_id,
+        case(
+            (and_(Defect.due_date.isnot(None), Defect.due_date < date.today()),
+             func.current_date() - Defect.due_date),
+            else_=0
+        ).label('overdue_days'),
+        func.row_number().over(
+            partition_by=Defect.project_id,
+            order_by=(Priority.urgency_level.desc(), Defect.created_at.asc())
+        ).label('rank')
+    ).join(
+        Priority, Defect.priority_id == Priority.id
+    ).join(
+        DefectStatus, Defect.status_id == DefectStatus.id
+    ).filter(
+        visible,
+        DefectStatus.name.in_(['open', 'in_progress']),
+        or_(
+            Priority.name == 'critical',
+            Defect.due_date < date.today()
+        )
+    ).subquery()
+    
+    critical_rows = db.query(ranked, User).outerjoin(
+        User, ranked.c.assignee_id == User.id
+    ).filter(
+        ranked.c.rank <= top
+    ).order_by(
+        ranked.c.project_id,
+        ranked.c.rank
+    ).all()
+    
+    critical = {}
+    for row in critical_rows:
+        user = row.User
+        assignee_name = "Не назначен"
+        if user:
+            assignee_name = f"{user.first_name} {user.last_name}" if user.first_name else user.username
+        
+        critical.setdefault(row.project_id, []).append({
+            "id": f"DEF-{row.defect_id}",
+            "title": row.title,
+            "location": row.location or "Местоположение не указано",
+            "assignee": assignee_name,
+            "overdueDays": max(0, int(row.overdue_days) if row.overdue_days else 0)
+        })
+    
+    result = []
+    for membership in memberships:
+        project_metrics = metrics.get(membership.id)
+        result.append({
+            "projectId": membership.id,
+            "projectName": membership.name,
+            "metrics": {
+                "totalDefects": project_metrics.total_defects if project_metrics else 0,
+                "inProgress": project_metrics.in_progress if project_metrics else 0,
+                "overdue": project_metrics.overdue if project_metrics else 0
+            },
+            "criticalDefects": critical.get(membership.id, [])
+        })
+    
+    return result
+
 
 @router.get("/{project_id}/metrics")
 def get_project_metrics(
@@ -45,32 +212,36 @@ def get_project_metrics(
     
     user_role_name = get_user_role_in_project(current_user.id, project_id, db)
     is_engineer = user_role_name == 'engineer'
+    viewer_id = current_user.id if is_engineer else None
     
-    defect_filter = Defect.project_id == project_id
-    if is_engineer:
-        defect_filter = and_(Defect.project_id == project_id, Defect.assignee_id == current_user.id)
-    
-    total_defects = db.query(func.count(Defect.id)).join(DefectStatus).filter(
-        defect_filter,
-        DefectStatus.name != 'closed'
-    ).scalar()
-    
-    in_progress_count = db.query(func.count(Defect.id)).join(DefectStatus).filter(
-        defect_filter,
-        DefectStatus.name == 'in_progress'
-    ).scalar()
-    
-    overdue_count = db.query(func.count(Defect.id)).join(DefectStatus).filter(
-        defect_filter,
-        Defect.due_date < date.today(),
-        DefectStatus.is_final == False
-    ).scalar()
+    def compute():
+        defect_filter = Defect.project_id == project_id
+        if is_engineer:
+            defect_filter = and_(Defect.project_id == project_id, Defect.assignee_id == current_user.id)
+        
+        total_defects = db.query(func.count(Defect.id)).join(DefectStatus).filter(
+            defect_filter,
+            DefectStatus.name != 'closed'
+        ).scalar()
+        
+        in_progress_count = db.query(func.count(Defect.id)).join(DefectStatus).filter(
+            defect_filter,
+            DefectStatus.name == 'in_progress'
+        ).scalar()
+        
+        overdue_count = db.query(func.count(Defect.id)).join(DefectStatus).filter(
+            defect_filter,
+            Defect.due_date < date.today(),
+            DefectStatus.is_final == False
+        ).scalar()
+        
+        return {
+            "totalDefects": total_defects or 0,
+            "inProgress": in_progress_count or 0,
+            "overdue": overdue_count or 0
+        }
     
-    return {
-        "totalDefects": total_defects or 0,
-        "inProgress": in_progress_count or 0,
-        "overdue": overdue_count or 0
-    }
+    return dashboard_cache.get_or_compute(project_id, ("metrics", viewer_id), compute)
 
 
 @router.get("/{project_id}/critical-defects")
@@ -101,57 +272,61 @@ def get_critical_defects(
     
     user_role_name = get_user_role_in_project(current_user.id, project_id, db)
     is_engineer = user_role_name == 'engineer'
+    viewer_id = current_user.id if is_engineer else None
     
-    critical_priority = db.query(Priority).filter(Priority.name == 'critical').first()
-    
-    query = db.query(
-        Defect,
-        User,
-        Priority,
-        DefectStatus,
-        case(
-            (and_(Defect.due_date.isnot(None), Defect.due_date < date.today()), 
-             func.current_date() - Defect.due_date),
-            else_=0
-        ).label('overdue_days')
-    ).outerjoin(
-        User, Defect.assignee_id == User.id
-    ).join(
-        Priority, Defect.priority_id == Priority.id
-    ).join(
-        DefectStatus, Defect.status_id == DefectStatus.id
-    ).filter(
-        Defect.project_id == project_id,
-        DefectStatus.name.in_(['open', 'in_progress']),
-        or_(
-            Defect.priority_id == critical_priority.id if critical_priority else False,
-            Defect.due_date < date.today()
+    def compute():
+        critical_priority = db.query(Priority).filter(Priority.name == 'critical').first()
+        
+        query = db.query(
+            Defect,
+            User,
+            Priority,
+            DefectStatus,
+            case(
+                (and_(Defect.due_date.isnot(None), Defect.due_date < date.today()), 
+                 func.current_date() - Defect.due_date),
+                else_=0
+            ).label('overdue_days')
+        ).outerjoin(
+            User, Defect.assignee_id == User.id
+        ).join(
+            Priority, Defect.priority_id == Priority.id
+        ).join(
+            DefectStatus, Defect.status_id == DefectStatus.id
+        ).filter(
+            Defect.project_id == project_id,
+            DefectStatus.name.in_(['open', 'in_progress']),
+            or_(
+                Defect.priority_id == critical_priority.id if critical_priority else False,
+                Defect.due_date < date.today()
+            )
         )
-    )
-    
-    if is_engineer:
-        query = query.filter(Defect.assignee_id == current_user.id)
-    
-    defects = query.order_by(
-        Priority.urgency_level.desc(),
-        Defect.created_at.asc()
-    ).limit(2).all()
-    
-    result = []
-    for defect, user, priority, status, overdue_days in defects:
-        assignee_name = "Не назначен"
-        if user:
-            assignee_name = f"{user.first_name} {user.last_name}" if user.first_name else user.username
         
-        result.append({
-            "id": f"DEF-{defect.id}",
-            "title": defect.title,
-            "location": defect.location or "Местоположение не указано",
-            "assignee": assignee_name,
-            "overdueDays": max(0, int(overdue_days) if overdue_days else 0)
-        })
+        if is_engineer:
+            query = query.filter(Defect.assignee_id == current_user.id)
+        
+        defects = query.order_by(
+            Priority.urgency_level.desc(),
+            Defect.created_at.asc()
+        ).limit(2).all()
+        
+        result = []
+        for defect, user, priority, status, overdue_days in defects:
+            assignee_name = "Не назначен"
+            if user:
+                assignee_name = f"{user.first_name} {user.last_name}" if user.first_name else user.username
+            
+            result.append({
+                "id": f"DEF-{defect.id}",
+                "title": defect.title,
+                "location": defect.location or "Местоположение не указано",
+                "assignee": assignee_name,
+                "overdueDays": max(0, int(overdue_days) if overdue_days else 0)
+            })
+        
+        return result
     
-    return result
+    return dashboard_cache.get_or_compute(project_id, ("critical-defects", viewer_id), compute)
 
 
 @router.get("/{project_id}/recent-actions")
@@ -182,36 +357,42 @@ def get_recent_actions(
     
     user_role_name = get_user_role_in_project(current_user.id, project_id, db)
     is_engineer = user_role_name == 'engineer'
+    viewer_id = current_user.id if is_engineer else None
     
-    query = db.query(ChangeLog, User, Defect).join(
-        User, ChangeLog.user_id == User.id
-    ).join(
-        Defect, ChangeLog.defect_id == Defect.id
-    ).filter(
-        Defect.project_id == project_id
-    )
-    
-    if is_engineer:
-        query = query.filter(Defect.assignee_id == current_user.id)
-    
-    change_logs = query.order_by(
-        ChangeLog.created_at.desc()
-    ).limit(3).all()
-    
-    result = []
-    for log, user, defect in change_logs:
-        user_name = f"{user.first_name} {user.last_name}" if user.first_name else user.username
+    def compute():
+        query = db.query(ChangeLog, User).join(
+            User, ChangeLog.user_id == User.id
+        ).filter(
+            ChangeLog.project_id == project_id
+        )
         
-        action = _format_action(log, db)
+        if is_engineer:
+            query = query.join(
+                Defect, ChangeLog.defect_id == Defect.id
+            ).filter(Defect.assignee_id == current_user.id)
         
-        result.append({
-            "id": log.id,
-            "time": log.created_at.strftime("%H:%M"),
-            "user": user_name,
-            "action": action
-        })
+        change_logs = query.order_by(
+            ChangeLog.created_at.desc()
+        ).limit(3).all()
+        
+        names = _resolve_action_names([log for log, _ in change_logs], db)
+        
+        result = []
+        for log, user in change_logs:
+            user_name = f"{user.first_name} {user.last_name}" if user.first_name else user.username
+            
+            action = _format_action(log, names)
+            
+            result.append({
+                "id": log.id,
+                "time": log.created_at.strftime("%H:%M"),
+                "user": user_name,
+                "action": action
+            })
+        
+        return result
     
-    return result
+    return dashboard_cache.get_or_compute(project_id, ("recent-actions", viewer_id), compute)
 
 
 @router.get("/{project_id}/all-actions")
@@ -249,7 +430,7 @@ def get_all_actions(
     ).join(
         Defect, ChangeLog.defect_id == Defect.id
     ).filter(
-        Defect.project_id == project_id
+        ChangeLog.project_id == project_id
     )
     
     if is_engineer:
@@ -271,11 +452,13 @@ def get_all_actions(
         ChangeLog.created_at.desc()
     ).limit(100).all()
     
+    names = _resolve_action_names([log for log, _, _ in change_logs], db)
+    
     result = []
     for log, user, defect in change_logs:
         user_name = f"{user.first_name} {user.last_name}" if user.first_name else user.username
         
-        action = _format_action(log, db)
+        action = _format_action(log, names)
         
         result.append({
             "id": log.id,
@@ -289,8 +472,496 @@ def get_all_actions(
     return result
 
 
-def _format_action(log: ChangeLog, db: Session) -> str:
-    """Format action description based on change type."""
+@router.get("/{project_id}/history")
+def get_action_history(
+    project_id: int,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    user_id: Optional[int] = Query(None),
+    change_type: Optional[str] = Query(None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get project action history page by page, newest first.
+    
+    Pages are keyset-paginated on (created_at, id): pass ``nextCursor`` from
+    the previous page as ``cursor`` to continue further back, at the same
+    cost for every page. Engineers only see changes on their assigned
+    defects; their pages walk the change log of those defects instead, so
+    they cost more the more those defects have changed, however busy the
+    rest of the project is.
+    """
+    project = db.query(Project).filter(Project.id == project_id).first()
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    if not current_user.is_superuser:
+        user_role = db.query(UserRole).filter(
+            UserRole.project_id == project_id,
+            UserRole.user_id == current_user.id
+        ).first()
+        
+        if not user_role:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have access to this project"
+            )
+    
+    if change_type is not None and change_type not in CHANGE_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid change type. Allowed types: {', '.join(CHANGE_TYPES)}"
+        )
+    
+    user_role_name = get_user_role_in_project(current_user.id, project_id, db)
+    is_engineer = user_role_name == 'engineer'
+    
+    query = db.query(ChangeLog, User).join(
+        User, ChangeLog.user_id == User.id
+    ).filter(
+        ChangeLog.project_id == project_id
+    )
+    
+    if is_engineer:
+        assigned_defect_ids = db.query(Defect.id).filter(
+            Defect.project_id == project_id,
+            Defect.assignee_id == current_user.id
+        )
+        query = query.filter(ChangeLog.defect_id.in_(assigned_defect_ids))
+    
+    if user_id is not None:
+        query = query.filter(ChangeLog.user_id == user_id)
+    
+    if change_type is not None:
+        query = query.filter(ChangeLog.change_type == change_type)
+    
+    if date_from is not None:
+        query = query.filter(ChangeLog.created_at >= date_from)
+    
+    if date_to is not None:
+        query = query.filter(ChangeLog.created_at < date_to + timedelta(days=1))
+    
+    if cursor:
+        cursor_created_at, cursor_id = _decode_history_cursor(cursor)
+        query = query.filter(
+            tuple_(ChangeLog.created_at, ChangeLog.id) < tuple_(cursor_created_at, cursor_id)
+        )
+    
+    # One extra row tells us whether there is a next page
+    change_logs = query.order_by(
+        ChangeLog.created_at.desc(),
+        ChangeLog.id.desc()
+    ).limit(limit + 1).all()
+    
+    has_more = len(change_logs) > limit
+    change_logs = change_logs[:limit]
+    
+    names = _resolve_action_names([log for log, _ in change_logs], db)
+    
+    # Titles are looked up for the page only, so deep pages never join defects
+    defect_ids = {log.defect_id for log, _ in change_logs}
+    defect_titles = dict(
+        db.query(Defect.id, Defect.title).filter(Defect.id.in_(defect_ids)).all()
+    ) if defect_ids else {}
+    
+    items = []
+    for log, user in change_logs:
+        user_name = f"{user.first_name} {user.last_name}" if user.first_name else user.username
+        
+        items.append({
+            "id": log.id,
+            "time": log.created_at.strftime("%d.%m.%Y %H:%M"),
+            "createdAt": log.created_at.isoformat(),
+            "user": user_name,
+            "userId": log.user_id,
+            "changeType": log.change_type,
+            "action": _format_action(log, names),
+            "defectId": log.defect_id,
+            "defectTitle": defect_titles.get(log.defect_id)
+        })
+    
+    next_cursor = None
+    if has_more:
+        last_log = change_logs[-1][0]
+        next_cursor = _encode_history_cursor(last_log.created_at, last_log.id)
+    
+    return {
+        "items": items,
+        "nextCursor": next_cursor
+    }
+
+
+def _encode_history_cursor(created_at: datetime, log_id: int) -> str:
+    """Encode a history position as an opaque cursor."""
+    raw = f"{created_at.isoformat()}|{log_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def _decode_history_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by ``_encode_history_cursor``."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        created_at, log_id = raw.split('|')
+        return datetime.fromisoformat(created_at), int(log_id)
+    except (ValueError, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+@router.get("/{project_id}/analytics")
+def get_project_analytics(
+    project_id: int,
+    days: int = Query(30, ge=1, le=365),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get project trends: MTTR per priority, burn-down and cumulative flow.
+    
+    Results are cached per project and window until the end of the day.
+    """
+    project = db.query(Project).filter(Project.id == project_id).first()
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    if not has_permission(current_user, project_id, Permission.VIEW_REPORTS, db):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only supervisors and managers can view analytics"
+        )
+    
+    cache_key = (project_id, days)
+    cached = analytics_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    end_date = date.today()
+    start_date = end_date - timedelta(days=days - 1)
+    
+    rows = db.query(
+        Defect.id,
+        Defect.priority_id,
+        Defect.status_id,
+        Defect.created_at,
+        Defect.closed_at,
+        ChangeLog.created_at.label('transition_at'),
+        ChangeLog.old_value,
+        ChangeLog.new_value
+    ).outerjoin(
+        ChangeLog,
+        and_(
+            ChangeLog.defect_id == Defect.id,
+            ChangeLog.field_name == 'status_id'
+        )
+    ).filter(
+        Defect.project_id == project_id
+    ).order_by(
+        Defect.id,
+        ChangeLog.created_at
+    ).all()
+    
+    statuses = db.query(DefectStatus).order_by(DefectStatus.order_index).all()
+    priorities = db.query(Priority).order_by(Priority.urgency_level).all()
+    
+    result = compute_project_analytics(rows, statuses, priorities, start_date, end_date)
+    analytics_cache.set(cache_key, result)
+    
+    return result
+
+
+@router.get("/{project_id}/workload")
+def get_project_workload(
+    project_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get open, in-progress and overdue defect counts per project member."""
+    project = db.query(Project).filter(Project.id == project_id).first()
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    if not has_permission(current_user, project_id, Permission.VIEW_REPORTS, db):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only supervisors and managers can view workload"
+        )
+    
+    cached = workload_cache.get(project_id)
+    if cached is not None:
+        return cached
+    
+    members = db.query(UserRole.user_id).filter(
+        UserRole.project_id == project_id
+    ).distinct().subquery()
+    
+    is_open = DefectStatus.is_final == False
+    
+    rows = db.query(
+        User.id,
+        User.username,
+        User.first_name,
+        User.last_name,
+        func.count(Defect.id).filter(is_open).label('open_count'),
+        func.count(Defect.id).filter(DefectStatus.name == 'in_progress').label('in_progress_count'),
+        func.count(Defect.id).filter(is_open, Defect.due_date < date.today()).label('overdue_count'),
+        func.avg(
+            func.extract('epoch', func.now() - Defect.created_at) / 86400
+        ).filter(is_open).label('average_age_days'),
+        func.sum(Defect.estimated_hours).filter(is_open).label('estimated_hours'),
+        func.sum(Defect.actual_hours).filter(is_open).label('actual_hours')
+    ).select_from(members).join(
+        User, members.c.user_id == User.id
+    ).outerjoin(
+        Defect, and_(
+            Defect.project_id == project_id,
+            Defect.assignee_id == User.id
+        )
+    ).outerjoin(
+        DefectStatus, Defect.status_id == DefectStatus.id
+    ).filter(
+        User.is_superuser == False
+    ).group_by(
+        User.id
+    ).order_by(
+        func.count(Defect.id).filter(is_open).desc(),
+        User.id
+    ).all()
+    
+    result = []
+    for row in rows:
+        result.append({
+            "userId": row.id,
+            "userName": f"{row.first_name} {row.last_name}" if row.first_name else row.username,
+            "open": row.open_count,
+            "inProgress": row.in_progress_count,
+            "overdue": row.overdue_count,
+            "averageAgeDays": round(float(row.average_age_days), 1) if row.average_age_days is not None else None,
+            "estimatedHours": float(row.estimated_hours or 0),
+            "actualHours": float(row.actual_hours or 0)
+        })
+    
+    workload_cache.set(project_id, result)
+    
+    return result
+
+
+@router.get("/{project_id}/stream")
+async def stream_actions(
+    project_id: int,
+    request: Request,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Stream new project actions as Server-Sent Events.
+    
+    Engineers only receive actions on their assigned defects. Event ids are
+    the project's change log sequence numbers, which follow commit order, so
+    reconnecting clients resume after the one sent in the Last-Event-ID header.
+    """
+    assignee_id = await run_in_threadpool(_get_stream_assignee_filter, project_id, current_user, db)
+    
+    # The stream can stay open for hours, don't pin a pooled connection to it
+    db.close()
+    
+    try:
+        after_seq = int(last_event_id) if last_event_id else None
+    except ValueError:
+        after_seq = None
+    
+    return StreamingResponse(
+        _stream_events(request, project_id, assignee_id, after_seq),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+def _get_stream_assignee_filter(project_id: int, current_user: User, db: Session) -> Optional[int]:
+    """Check stream access and return the assignee filter for engineers."""
+    project = db.query(Project).filter(Project.id == project_id).first()
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    if not current_user.is_superuser:
+        user_role = db.query(UserRole).filter(
+            UserRole.project_id == project_id,
+            UserRole.user_id == current_user.id
+        ).first()
+        
+        if not user_role:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have access to this project"
+            )
+    
+    user_role_name = get_user_role_in_project(current_user.id, project_id, db)
+    return current_user.id if user_role_name == 'engineer' else None
+
+
+async def _stream_events(request: Request, project_id: int, assignee_id: Optional[int], after_seq: Optional[int]):
+    """Yield SSE messages for actions committed after sequence number ``after_seq``."""
+    subscriber = activity_stream.subscribe(project_id, assignee_id)
+    try:
+        if after_seq is None:
+            after_seq = await run_in_threadpool(_get_latest_action_seq, project_id)
+        else:
+            # Replay what the client missed while disconnected
+            subscriber.changed.set()
+        
+        while not await request.is_disconnected():
+            try:
+                await asyncio.wait_for(subscriber.changed.wait(), timeout=STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            
+            subscriber.changed.clear()
+            events = await run_in_threadpool(_load_actions_after, project_id, after_seq, assignee_id)
+            
+            for event in events:
+                after_seq = event["seq"]
+                yield f"id: {event['seq']}\nevent: action\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+            
+            if len(events) == STREAM_BATCH_SIZE:
+                subscriber.changed.set()
+    finally:
+        activity_stream.unsubscribe(subscriber)
+
+
+def _get_latest_action_seq(project_id: int) -> int:
+    """Get the sequence number of the most recent change log in a project."""
+    db = SessionLocal()
+    try:
+        latest_seq = db.query(func.max(ChangeLog.project_seq)).filter(
+            ChangeLog.project_id == project_id
+        ).scalar()
+        return latest_seq or 0
+    finally:
+        db.close()
+
+
+def _load_actions_after(project_id: int, after_seq: int, assignee_id: Optional[int]) -> List[dict]:
+    """Load and format project actions with a sequence number greater than ``after_seq``."""
+    db = SessionLocal()
+    try:
+        query = db.query(ChangeLog, User, Defect).join(
+            User, ChangeLog.user_id == User.id
+        ).join(
+            Defect, ChangeLog.defect_id == Defect.id
+        ).filter(
+            ChangeLog.project_id == project_id,
+            ChangeLog.project_seq > after_seq
+        )
+        
+        if assignee_id is not None:
+            query = query.filter(Defect.assignee_id == assignee_id)
+        
+        change_logs = query.order_by(ChangeLog.project_seq.asc()).limit(STREAM_BATCH_SIZE).all()
+        
+        names = _resolve_action_names([log for log, _, _ in change_logs], db)
+        
+        result = []
+        for log, user, defect in change_logs:
+            user_name = f"{user.first_name} {user.last_name}" if user.first_name else user.username
+            
+            result.append({
+                "id": log.id,
+                "seq": log.project_seq,
+                "time": log.created_at.strftime("%H:%M"),
+                "user": user_name,
+                "action": _format_action(log, names),
+                "defectId": defect.id,
+                "defectTitle": defect.title
+            })
+        
+        return result
+    finally:
+        db.close()
+
+
+def _parse_id(value: Optional[str]) -> Optional[int]:
+    """Parse an id stored as text in a change log value."""
+    try:
+        return int(value) if value else None
+    except (ValueError, TypeError):
+        return None
+
+
+def _resolve_action_names(logs: List[ChangeLog], db: Session) -> dict:
+    """Resolve display names for all ids referenced by a page of change logs.
+    
+    Issues at most one query per referenced type (status, priority, user),
+    so formatting a page costs the same number of queries regardless of size.
+    """
+    status_ids = set()
+    priority_ids = set()
+    user_ids = set()
+    
+    for log in logs:
+        if log.change_type == 'status_change' or (log.change_type == 'update' and log.field_name == 'status_id'):
+            target = status_ids
+        elif log.change_type == 'update' and log.field_name == 'priority_id':
+            target = priority_ids
+        elif log.change_type == 'update' and log.field_name == 'assignee_id':
+            target = user_ids
+        else:
+            continue
+        
+        for value in (log.old_value, log.new_value):
+            parsed = _parse_id(value)
+            if parsed is not None:
+                target.add(parsed)
+    
+    names = {"statuses": {}, "priorities": {}, "users": {}}
+    
+    if status_ids:
+        for status_id, display_name in db.query(DefectStatus.id, DefectStatus.display_name).filter(
+            DefectStatus.id.in_(status_ids)
+        ).all():
+            names["statuses"][status_id] = _fix_status_name(display_name)
+    
+    if priority_ids:
+        for priority_id, display_name in db.query(Priority.id, Priority.display_name).filter(
+            Priority.id.in_(priority_ids)
+        ).all():
+            names["priorities"][priority_id] = display_name
+    
+    if user_ids:
+        for user_id, username, first_name, last_name in db.query(
+            User.id, User.username, User.first_name, User.last_name
+        ).filter(User.id.in_(user_ids)).all():
+            names["users"][user_id] = f"{first_name} {last_name}" if first_name else username
+    
+    return names
+
+
+def _format_action(log: ChangeLog, names: dict) -> str:
+    """Format action description based on change type.
+    
+    Referenced statuses, priorities and users are looked up in ``names``
+    as built by ``_resolve_action_names``; no queries are issued here.
+    """
+    def lookup(kind: str, value: Optional[str], default: str) -> str:
+        return names[kind].get(_parse_id(value), default)
+    
     if log.change_type == 'create':
         return "создал дефект"
     
@@ -307,38 +978,26 @@ def _format_action(log: ChangeLog, db: Session) -> str:
         elif log.field_name == 'comment':
             return "добавил комментарий"
         elif log.field_name == 'status_id':
-            old_status = db.query(DefectStatus).filter(DefectStatus.id == int(log.old_value)).first() if log.old_value else None
-            new_status = db.query(DefectStatus).filter(DefectStatus.id == int(log.new_value)).first() if log.new_value else None
-            
-            old_name = _fix_status_name(old_status.display_name) if old_status else "Неизвестно"
-            new_name = _fix_status_name(new_status.display_name) if new_status else "Неизвестно"
+            old_name = lookup("statuses", log.old_value, "Неизвестно")
+            new_name = lookup("statuses", log.new_value, "Неизвестно")
             
             return f'изменил статус с "{old_name}" на "{new_name}"'
         elif log.field_name == 'priority_id':
-            old_priority = db.query(Priority).filter(Priority.id == int(log.old_value)).first() if log.old_value else None
-            new_priority = db.query(Priority).filter(Priority.id == int(log.new_value)).first() if log.new_value else None
-            
-            old_name = old_priority.display_name if old_priority else "Неизвестно"
-            new_name = new_priority.display_name if new_priority else "Неизвестно"
+            old_name = lookup("priorities", log.old_value, "Неизвестно")
+            new_name = lookup("priorities", log.new_value, "Неизвестно")
             
             return f'изменил приоритет с "{old_name}" на "{new_name}"'
         elif log.field_name == 'assignee_id':
-            old_user = db.query(User).filter(User.id == int(log.old_value)).first() if log.old_value else None
-            new_user = db.query(User).filter(User.id == int(log.new_value)).first() if log.new_value else None
-            
-            old_name = f"{old_user.first_name} {old_user.last_name}" if old_user and old_user.first_name else (old_user.username if old_user else "Не назначен")
-            new_name = f"{new_user.first_name} {new_user.last_name}" if new_user and new_user.first_name else (new_user.username if new_user else "Не назначен")
+            old_name = lookup("users", log.old_value, "Не назначен")
+            new_name = lookup("users", log.new_value, "Не назначен")
             
             return f'изменил исполнителя с "{old_name}" на "{new_name}"'
         else:
             return f"изменил поле {log.field_name}"
     
     if log.change_type == 'status_change':
-        old_status = db.query(DefectStatus).filter(DefectStatus.id == int(log.old_value)).first() if log.old_value else None
-        new_status = db.query(DefectStatus).filter(DefectStatus.id == int(log.new_value)).first() if log.new_value else None
-        
-        old_name = _fix_status_name(old_status.display_name) if old_status else "Неизвестно"
-        new_name = _fix_status_name(new_status.display_name) if new_status else "Неизвестно"
+        old_name = lookup("statuses", log.old_value, "Неизвестно")
+        new_name = lookup("statuses", log.new_value, "Неизвестно")
         
         return f'изменил статус с "{old_name}" на "{new_name}"'
     
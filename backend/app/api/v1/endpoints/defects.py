@@ -11,7 +11,9 @@ from app.models.defect import Defect, DefectStatus, Priority
 from app.models.change_log import ChangeLog
 from app.models.comment import Comment
 from app.models.user import User
-from app.core.deps import get_current_user, user_has_role_in_project, get_user_role_in_project
+from app.core.deps import get_current_user
+from app.core.permissions import Permission, get_project_permissions
+from app.core.project_stats import record_defect_created, record_defect_deleted
 from app.schemas.defect import (
     Defect as DefectSchema,
     DefectCreate,
@@ -124,20 +126,19 @@ def create_defect(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Create new defect. Supervisors cannot create defects."""
-    if not current_user.is_superuser:
-        user_role = get_user_role_in_project(current_user.id, defect_in.project_id, db)
-        if not user_role:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have access to this project"
-            )
-        
-        if user_role == 'supervisor':
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Supervisors cannot create defects"
-            )
+    """Create new defect. Requires the create defects permission."""
+    permissions = get_project_permissions(current_user, defect_in.project_id, db)
+    if not permissions & Permission.VIEW_PROJECT:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have access to this project"
+        )
+    
+    if not permissions & Permission.CREATE_DEFECTS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Your role cannot create defects"
+        )
     
     try:
         year = datetime.now().year
@@ -157,8 +158,11 @@ def create_defect(
         db.add(db_defect)
         db.flush()
         
+        record_defect_created(db, db_defect.project_id)
+        
         change_log = ChangeLog(
             defect_id=db_defect.id,
+            project_id=db_defect.project_id,
             user_id=defect_in.reporter_id,
             field_name="defect",
             new_value=defect_number,
@@ -186,7 +190,7 @@ def update_defect(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Update defect. Supervisors cannot update defects."""
+    """Update defect. Requires the edit defects permission."""
     defect = db.query(Defect).filter(Defect.id == defect_id).first()
     if not defect:
         raise HTTPException(
@@ -194,12 +198,12 @@ def update_defect(
             detail="Defect not found"
         )
     
-    if not current_user.is_superuser:
-        if user_has_role_in_project(current_user.id, defect.project_id, ['supervisor'], db):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Supervisors cannot edit defects"
-            )
+    permissions = get_project_permissions(current_user, defect.project_id, db)
+    if not permissions & Permission.EDIT_DEFECTS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Your role cannot edit defects"
+        )
     
     current_status = db.query(DefectStatus).filter(DefectStatus.id == defect.status_id).first()
     if current_status and current_status.name == 'closed':
@@ -215,24 +219,12 @@ def update_defect(
             status_name = update_data.pop('status')
             new_status = db.query(DefectStatus).filter(DefectStatus.name == status_name).first()
             if new_status:
-                is_manager = user_has_role_in_project(current_user.id, defect.project_id, ['manager'], db)
-                is_engineer = user_has_role_in_project(current_user.id, defect.project_id, ['engineer'], db)
-                
-                current_defect_status = db.query(DefectStatus).filter(DefectStatus.id == defect.status_id).first()
-                
-                if current_defect_status:
-                    if current_defect_status.name == 'review' and not is_manager:
-                        raise HTTPException(
-                            status_code=status.HTTP_403_FORBIDDEN,
-                            detail="Only managers can change status from 'review'"
-                        )
-                    
-                    if current_defect_status.name in ['new', 'in_progress']:
-                        if not (is_manager or is_engineer):
-                            raise HTTPException(
-                                status_code=status.HTTP_403_FORBIDDEN,
-                                detail="Insufficient permissions to change status"
-                            )
+                # Other transitions only need the edit permission checked above
+                if current_status and current_status.name == 'review' and not permissions & Permission.REVIEW_DEFECTS:
+                    raise HTTPException(
+                        status_code=status.HTTP_403_FORBIDDEN,
+                        detail="Only managers can change status from 'review'"
+                    )
                 
                 update_data['status_id'] = new_status.id
         
@@ -244,6 +236,7 @@ def update_defect(
             if old_value != new_value:
                 change_log = ChangeLog(
                     defect_id=defect_id,
+                    project_id=defect.project_id,
                     user_id=current_user_id,
                     field_name=field,
                     old_value=str(old_value) if old_value is not None else None,
@@ -286,7 +279,12 @@ def delete_defect(
             detail="Defect not found"
         )
     
+    project_id = defect.project_id
+    
     db.delete(defect)
+    db.flush()
+    
+    record_defect_deleted(db, project_id)
     db.commit()
     
     return None
@@ -321,6 +319,7 @@ def update_overdue_defects(
             
             change_log = ChangeLog(
                 defect_id=defect.id,
+                project_id=defect.project_id,
                 user_id=current_user_id,
                 field_name="priority_id",
                 old_value=str(old_priority_id),
@@ -365,16 +364,15 @@ def create_comment(
             detail="Defect not found"
         )
     
-    is_engineer = user_has_role_in_project(current_user.id, defect.project_id, ['engineer'], db)
-    is_manager = user_has_role_in_project(current_user.id, defect.project_id, ['manager'], db)
+    permissions = get_project_permissions(current_user, defect.project_id, db)
     
-    if not (is_engineer or is_manager):
+    if not permissions & Permission.COMMENT:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only engineers and managers can add comments"
         )
     
-    if is_engineer and not is_manager:
+    if not permissions & Permission.VIEW_ALL_DEFECTS:
         if defect.assignee_id and defect.assignee_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -384,6 +382,7 @@ def create_comment(
     try:
         comment = Comment(
             defect_id=defect_id,
+            project_id=defect.project_id,
             author_id=current_user.id,
             content=content
         )
@@ -391,6 +390,7 @@ def create_comment(
         
         change_log = ChangeLog(
             defect_id=defect_id,
+            project_id=defect.project_id,
             user_id=current_user.id,
             field_name='comment',
             old_value=None,
@@ -436,17 +436,15 @@ def get_comments(
             detail="Defect not found"
         )
     
-    is_engineer = user_has_role_in_project(current_user.id, defect.project_id, ['engineer'], db)
-    is_manager = user_has_role_in_project(current_user.id, defect.project_id, ['manager'], db)
-    is_supervisor = user_has_role_in_project(current_user.id, defect.project_id, ['supervisor'], db)
+    permissions = get_project_permissions(current_user, defect.project_id, db)
     
-    if not (is_engineer or is_manager or is_supervisor):
+    if not permissions & Permission.VIEW_PROJECT:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have access to this defect"
         )
     
-    if is_engineer and not (is_manager or is_supervisor):
+    if not permissions & Permission.VIEW_ALL_DEFECTS:
         if defect.assignee_id and defect.assignee_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -501,16 +499,15 @@ def delete_comment(
             detail="Defect not found"
         )
     
-    is_engineer = user_has_role_in_project(current_user.id, defect.project_id, ['engineer'], db)
-    is_manager = user_has_role_in_project(current_user.id, defect.project_id, ['manager'], db)
+    permissions = get_project_permissions(current_user, defect.project_id, db)
     
-    if not (is_engineer or is_manager):
+    if not permissions & Permission.COMMENT:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only engineers and managers can delete comments"
         )
     
-    if is_engineer and not is_manager:
+    if not permissions & Permission.MODERATE_COMMENTS:
         if comment.author_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -520,6 +517,7 @@ def delete_comment(
     try:
         change_log = ChangeLog(
             defect_id=defect_id,
+            project_id=defect.project_id,
             user_id=current_user.id,
             field_name='comment',
             old_value=comment.content[:100] if len(comment.content) > 100 else comment.content,
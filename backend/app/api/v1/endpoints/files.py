@@ -94,6 +94,7 @@ async def upload_file(
         
         change_log = ChangeLog(
             defect_id=defect_id,
+            project_id=defect.project_id,
             user_id=current_user.id,
             field_name="attachment",
             new_value=file_data["original_name"],
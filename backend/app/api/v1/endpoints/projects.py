@@ -3,15 +3,16 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import select
 
 from app.db import get_db
 from app.models.project import Project
 from app.models.role import UserRole, Role
-from app.models.defect import Defect
 from app.models.user import User
 from app.schemas.project import Project as ProjectSchema, ProjectCreate, ProjectUpdate, ProjectDetail
-from app.core.deps import get_current_user, user_has_role_in_project, get_user_role_in_project
+from app.core.deps import get_current_user
+from app.core.permissions import Permission, require
+from app.core.project_stats import refresh_team_size
 
 router = APIRouter()
 
@@ -24,43 +25,17 @@ def get_projects(
     db: Session = Depends(get_db)
 ):
     """Get all projects with statistics (superuser sees all, others see only their projects)."""
-    if current_user.is_superuser:
-        projects = db.query(Project).offset(skip).limit(limit).all()
-    else:
-        user_project_ids = db.query(UserRole.project_id).filter(
+    query = db.query(Project)
+    
+    if not current_user.is_superuser:
+        user_project_ids = select(UserRole.project_id).where(
             UserRole.user_id == current_user.id
-        ).distinct().all()
-        user_project_ids = [pid[0] for pid in user_project_ids]
-        
-        projects = db.query(Project).filter(
-            Project.id.in_(user_project_ids)
-        ).offset(skip).limit(limit).all()
+        )
+        query = query.filter(Project.id.in_(user_project_ids))
     
-    result = []
-    for project in projects:
-        defects_count = db.query(func.count(Defect.id)).filter(
-            Defect.project_id == project.id
-        ).scalar()
-        
-        team_size = db.query(func.count(func.distinct(UserRole.user_id))).join(
-            User, UserRole.user_id == User.id
-        ).filter(
-            UserRole.project_id == project.id,
-            User.is_superuser == False
-        ).scalar()
-        
-        last_defect_date = db.query(Defect.created_at).filter(
-            Defect.project_id == project.id
-        ).order_by(Defect.created_at.desc()).limit(1).scalar()
-        
-        project_data = ProjectSchema.model_validate(project)
-        project_data.defects_count = defects_count or 0
-        project_data.team_size = team_size or 0
-        project_data.last_defect_date = last_defect_date
-        
-        result.append(project_data)
+    projects = query.offset(skip).limit(limit).all()
     
-    return result
+    return [ProjectSchema.model_validate(project) for project in projects]
 
 
 @router.get("/{project_id}", response_model=ProjectDetail)
@@ -77,50 +52,41 @@ def get_project(
             detail="Organization not found"
         )
     
-    if not current_user.is_superuser:
-        user_role = db.query(UserRole).filter(
-            UserRole.project_id == project_id,
-            UserRole.user_id == current_user.id
-        ).first()
-        
-        if not user_role:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have access to this organization"
-            )
-    
-    user_roles = db.query(UserRole).filter(UserRole.project_id == project_id).all()
-    users_data = []
-    for ur in user_roles:
-        users_data.append({
-            "userId": str(ur.user_id),
-            "role": ur.role.name,
-            "userName": f"{ur.user.first_name} {ur.user.last_name}" if ur.user.first_name else ur.user.username
-        })
-    
-
-    defects_count = db.query(func.count(Defect.id)).filter(
-        Defect.project_id == project.id
-    ).scalar()
-    
-    team_size = db.query(func.count(func.distinct(UserRole.user_id))).join(
+    members = db.query(
+        UserRole.user_id,
+        Role.name.label('role_name'),
+        User.username,
+        User.first_name,
+        User.last_name
+    ).join(
+        Role, UserRole.role_id == Role.id
+    ).join(
         User, UserRole.user_id == User.id
     ).filter(
-        UserRole.project_id == project.id,
-        User.is_superuser == False
-    ).scalar()
+        UserRole.project_id == project_id
+    ).order_by(UserRole.id).all()
     
-    last_defect_date = db.query(Defect.created_at).filter(
-        Defect.project_id == project.id
-    ).order_by(Defect.created_at.desc()).limit(1).scalar()
+    current_user_role = next(
+        (member.role_name for member in members if member.user_id == current_user.id),
+        None
+    )
     
-    current_user_role = get_user_role_in_project(current_user.id, project_id, db)
+    if not current_user.is_superuser and current_user_role is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have access to this organization"
+        )
+    
+    users_data = []
+    for member in members:
+        users_data.append({
+            "userId": str(member.user_id),
+            "role": member.role_name,
+            "userName": f"{member.first_name} {member.last_name}" if member.first_name else member.username
+        })
     
     project_data = ProjectDetail.model_validate(project)
     project_data.users = users_data
-    project_data.defects_count = defects_count or 0
-    project_data.team_size = team_size or 0
-    project_data.last_defect_date = last_defect_date
     project_data.current_user_role = current_user_role
     
     return project_data
@@ -168,15 +134,13 @@ def create_project(
                     )
                     db.add(ur)
         
+        db.flush()
+        refresh_team_size(db, db_project.id)
+        
         db.commit()
         db.refresh(db_project)
         
-        project_response = ProjectSchema.model_validate(db_project)
-        project_response.defects_count = 0
-        project_response.team_size = len(project_in.user_roles) if project_in.user_roles else 0
-        project_response.last_defect_date = None
-        
-        return project_response
+        return ProjectSchema.model_validate(db_project)
         
     except Exception as e:
         db.rollback()
@@ -190,7 +154,7 @@ def create_project(
 def update_project(
     project_id: int,
     project_in: ProjectUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require(Permission.MANAGE_PROJECT, "Only supervisors can edit organization")),
     db: Session = Depends(get_db)
 ):
     """Update project. Only superuser or supervisor can update."""
@@ -201,13 +165,6 @@ def update_project(
             detail="Organization not found"
         )
     
-    if not current_user.is_superuser:
-        if not user_has_role_in_project(current_user.id, project_id, ['supervisor'], db):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only supervisors can edit organization"
-            )
-    
     try:
         update_data = project_in.model_dump(exclude_unset=True, exclude={"user_roles"})
         
@@ -226,31 +183,14 @@ def update_project(
                         granted_by=current_user.id
                     )
                     db.add(ur)
+            
+            db.flush()
+            refresh_team_size(db, project_id)
         
         db.commit()
         db.refresh(project)
         
-        defects_count = db.query(func.count(Defect.id)).filter(
-            Defect.project_id == project_id
-        ).scalar()
-        
-        team_size = db.query(func.count(func.distinct(UserRole.user_id))).join(
-            User, UserRole.user_id == User.id
-        ).filter(
-            UserRole.project_id == project_id,
-            User.is_superuser == False
-        ).scalar()
-        
-        last_defect_date = db.query(Defect.created_at).filter(
-            Defect.project_id == project_id
-        ).order_by(Defect.created_at.desc()).limit(1).scalar()
-        
-        project_response = ProjectSchema.model_validate(project)
-        project_response.defects_count = defects_count or 0
-        project_response.team_size = team_size or 0
-        project_response.last_defect_date = last_defect_date
-        
-        return project_response
+        return ProjectSchema.model_validate(project)
         
     except Exception as e:
         db.rollback()
@@ -263,7 +203,7 @@ def update_project(
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_project(
     project_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require(Permission.MANAGE_PROJECT, "Only supervisors can delete organization")),
     db: Session = Depends(get_db)
 ):
     """Delete project. Only superuser or supervisor can delete."""
@@ -274,13 +214,6 @@ def delete_project(
             detail="Organization not found"
         )
     
-    if not current_user.is_superuser:
-        if not user_has_role_in_project(current_user.id, project_id, ['supervisor'], db):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only supervisors can delete organization"
-            )
-    
     db.delete(project)
     db.commit()
     
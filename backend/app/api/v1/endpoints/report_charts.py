@@ -10,7 +10,8 @@ from app.db import get_db
 from app.models.user import User
 from app.models.defect import Defect
 from app.models.project import Project
-from app.core.deps import get_current_user, user_has_role_in_project
+from app.core.deps import get_current_user
+from app.core.permissions import Permission, has_permission
 
 router = APIRouter()
 
@@ -34,10 +35,7 @@ def get_report_chart_data(
     project_ids = report.project_ids if report.project_ids else [report.project_id]
     
     for proj_id in project_ids:
-        is_supervisor = user_has_role_in_project(current_user.id, proj_id, ['supervisor'], db)
-        is_manager = user_has_role_in_project(current_user.id, proj_id, ['manager'], db)
-        
-        if not (is_supervisor or is_manager):
+        if not has_permission(current_user, proj_id, Permission.VIEW_REPORTS, db):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied to report projects"
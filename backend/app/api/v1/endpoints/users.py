@@ -1,7 +1,9 @@
 """User endpoints."""
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+import base64
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import and_, exists, func, or_
 from sqlalchemy.orm import Session
 
 from app.db import get_db
@@ -9,43 +11,94 @@ from app.models.user import User
 from app.models.role import UserRole, Role
 from app.schemas.user import User as UserSchema, UserList, UserCreate, UserUpdate
 from app.core.deps import get_current_user
+from app.core.permissions import Permission, get_projects_with_permission
+from app.core.project_stats import refresh_team_size
 
 router = APIRouter()
 
+# Shorter terms produce no trigrams, so they are matched as prefixes instead
+MIN_TRIGRAM_TERM_LENGTH = 3
+
+SEARCH_COLUMNS = (User.username, User.first_name, User.last_name, User.email)
+
 
 @router.get("/", response_model=List[UserList])
 def get_users(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    search: Optional[str] = Query(None, max_length=100),
     project_id: int = None,
     roles: str = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=100),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all users (excludes superusers). 
+    """Get users ordered by username (excludes superusers).
     
     Optional filters:
+    - search: whitespace-separated terms, each matching username, name or email
     - project_id: filter users by project
     - roles: comma-separated role names (e.g. 'manager,engineer')
+    
+    Pass the X-Next-Cursor response header back as `cursor` to get the next page.
     """
     query = db.query(User).filter(User.is_superuser == False)
     
+    if search:
+        for term in search.split():
+            query = query.filter(_search_condition(term))
+    
     # Filter by project and roles if specified
     if project_id is not None:
-        query = query.join(UserRole, User.id == UserRole.user_id)
-        query = query.filter(UserRole.project_id == project_id)
+        membership = and_(UserRole.user_id == User.id, UserRole.project_id == project_id)
         
         if roles:
             role_list = [r.strip() for r in roles.split(',')]
-            query = query.join(Role, UserRole.role_id == Role.id)
-            query = query.filter(Role.name.in_(role_list))
+            membership = and_(
+                membership,
+                UserRole.role_id.in_(db.query(Role.id).filter(Role.name.in_(role_list)))
+            )
         
-        query = query.distinct()
+        query = query.filter(exists().where(membership))
+    
+    if cursor:
+        query = query.filter(User.username > _decode_user_cursor(cursor))
+    
+    # One extra row tells us whether there is a next page
+    users = query.order_by(User.username).limit(limit + 1).all()
+    
+    if len(users) > limit:
+        users = users[:limit]
+        response.headers["X-Next-Cursor"] = _encode_user_cursor(users[-1].username)
     
-    users = query.offset(skip).limit(limit).all()
     return users
 
 
+def _search_condition(term: str):
+    """Match a search term against any of the searchable user columns."""
+    escaped = term.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    
+    if len(term) < MIN_TRIGRAM_TERM_LENGTH:
+        return or_(*[func.lower(column).like(f"{escaped}%", escape='\\') for column in SEARCH_COLUMNS])
+    return or_(*[column.ilike(f"%{escaped}%", escape='\\') for column in SEARCH_COLUMNS])
+
+
+def _encode_user_cursor(username: str) -> str:
+    """Encode a directory position as an opaque cursor."""
+    return base64.urlsafe_b64encode(username.encode('utf-8')).decode('ascii')
+
+
+def _decode_user_cursor(cursor: str) -> str:
+    """Decode a cursor produced by ``_encode_user_cursor``."""
+    try:
+        return base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+    except (ValueError, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
 @router.get("/{user_id}", response_model=UserSchema)
 def get_user(
     user_id: int,
@@ -134,29 +187,35 @@ def delete_user(
             detail="User not found"
         )
     
+    project_ids = _member_project_ids(db, user_id)
     db.delete(user)
+    db.flush()
+    for project_id in project_ids:
+        refresh_team_size(db, project_id)
     db.commit()
     
     return None
 
 
+def _member_project_ids(db: Session, user_id: int) -> List[int]:
+    """Get the projects a user has roles in."""
+    return [
+        project_id for (project_id,) in db.query(UserRole.project_id).filter(
+            UserRole.user_id == user_id
+        ).distinct()
+    ]
+
+
 @router.get("/me/supervisor-projects")
 def get_user_supervisor_projects(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all projects where current user is a supervisor."""
-    from app.models.role import UserRole, Role
+    """Get all projects where current user can create reports, i.e. supervises."""
     from app.models.project import Project
     
-    projects = db.query(Project).join(
-        UserRole, Project.id == UserRole.project_id
-    ).join(
-        Role, UserRole.role_id == Role.id
-    ).filter(
-        UserRole.user_id == current_user.id,
-        Role.name == "supervisor"
-    ).all()
+    project_ids = get_projects_with_permission(current_user, Permission.CREATE_REPORTS, db)
+    projects = db.query(Project).filter(Project.id.in_(project_ids)).all() if project_ids else []
     
     return [
         {
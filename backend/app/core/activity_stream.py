@@ -0,0 +1,167 @@
+"""Live activity stream built on PostgreSQL LISTEN/NOTIFY."""
+
+import asyncio
+import json
+import logging
+from typing import Callable, Dict, List, Optional, Set
+
+import asyncpg
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Channel notified by the change_logs insert trigger
+CHANNEL = "change_logs"
+
+# Delay before reconnecting a lost listener connection
+RECONNECT_DELAY_SECONDS = 5
+
+
+class ActivitySubscriber:
+    """A single stream consumer waiting for changes in one project."""
+
+    def __init__(self, project_id: int, assignee_id: Optional[int] = None):
+        """Initialize subscriber.
+
+        Args:
+            project_id: Project whose change logs are of interest
+            assignee_id: If set, only changes on defects assigned to this user wake the subscriber
+        """
+        self.project_id = project_id
+        self.assignee_id = assignee_id
+        self.changed = asyncio.Event()
+
+    def accepts(self, payload: dict) -> bool:
+        """Check whether a notification is relevant to this subscriber."""
+        if self.assignee_id is None:
+            return True
+        return payload.get("assignee_id") == self.assignee_id
+
+
+class ActivityStream:
+    """Shares one LISTEN connection between all stream subscribers.
+
+    Notifications only wake subscribers up; each subscriber then reads the
+    change logs it has not yet seen, so missed or coalesced notifications
+    never lose events.
+    """
+
+    def __init__(self):
+        """Initialize the activity stream."""
+        self._subscribers: Dict[int, Set[ActivitySubscriber]] = {}
+        self._change_listeners: List[Callable[[Optional[int]], None]] = []
+        self._channel_listeners: Dict[str, List[Callable[[Optional[str]], None]]] = {}
+        self._connection: Optional[asyncpg.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start listening in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen_forever())
+            logger.info("Activity stream listener started")
+
+    async def stop(self):
+        """Stop listening and close the listener connection."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+        logger.info("Activity stream listener stopped")
+
+    def add_change_listener(self, callback: Callable[[Optional[int]], None]):
+        """Call ``callback(project_id)`` for every change log committed by any worker.
+
+        The callback gets None when notifications may have been missed.
+        """
+        self._change_listeners.append(callback)
+
+    def add_channel_listener(self, channel: str, callback: Callable[[Optional[str]], None]):
+        """Call ``callback(payload)`` for every notification on another channel.
+
+        Must be called before ``start``. The callback gets None when
+        notifications may have been missed.
+        """
+        self._channel_listeners.setdefault(channel, []).append(callback)
+
+    def subscribe(self, project_id: int, assignee_id: Optional[int] = None) -> ActivitySubscriber:
+        """Register a subscriber for a project."""
+        subscriber = ActivitySubscriber(project_id, assignee_id)
+        self._subscribers.setdefault(project_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: ActivitySubscriber):
+        """Remove a subscriber."""
+        project_subscribers = self._subscribers.get(subscriber.project_id)
+        if project_subscribers is None:
+            return
+        project_subscribers.discard(subscriber)
+        if not project_subscribers:
+            del self._subscribers[subscriber.project_id]
+
+    async def _listen_forever(self):
+        """Keep a LISTEN connection open, reconnecting when it drops."""
+        while True:
+            closed = asyncio.Event()
+            try:
+                self._connection = await asyncpg.connect(str(settings.DATABASE_URL))
+                self._connection.add_termination_listener(lambda _: closed.set())
+                await self._connection.add_listener(CHANNEL, self._on_notify)
+                for channel in self._channel_listeners:
+                    await self._connection.add_listener(channel, self._on_channel_notify)
+
+                # Anything committed while we were disconnected must be picked up
+                self._wake_all()
+
+                await closed.wait()
+                logger.warning("Activity stream connection lost, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Activity stream listener error: {str(e)}")
+
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    def _on_notify(self, connection, pid, channel, payload: str):
+        """Fan a notification out to the subscribers of its project."""
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            logger.error(f"Invalid activity notification payload: {payload}")
+            return
+
+        for callback in self._change_listeners:
+            callback(data.get("project_id"))
+
+        for subscriber in self._subscribers.get(data.get("project_id"), ()):
+            if subscriber.accepts(data):
+                subscriber.changed.set()
+
+    def _on_channel_notify(self, connection, pid, channel, payload: str):
+        """Pass a notification on another channel to its listeners."""
+        for callback in self._channel_listeners.get(channel, ()):
+            callback(payload)
+
+    def _wake_all(self):
+        """Wake every subscriber so it re-reads its project."""
+        for callback in self._change_listeners:
+            callback(None)
+
+        for callbacks in self._channel_listeners.values():
+            for callback in callbacks:
+                callback(None)
+
+        for project_subscribers in self._subscribers.values():
+            for subscriber in project_subscribers:
+                subscriber.changed.set()
+
+
+# Global activity stream instance
+activity_stream = ActivityStream()
@@ -0,0 +1,184 @@
+"""Project trend analytics computed with NumPy."""
+
+import threading
+from datetime import date, timedelta
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def _parse_status_ids(values: List[Optional[str]]) -> np.ndarray:
+    """Parse status ids stored as change log text, using -1 for unparsable values."""
+    result = np.full(len(values), -1, dtype=np.int64)
+    for i, value in enumerate(values):
+        try:
+            result[i] = int(value)
+        except (ValueError, TypeError):
+            pass
+    return result
+
+
+def _lookup_index(sorted_ids: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """Map ids to their position in ``sorted_ids``, using -1 for unknown ids."""
+    if len(sorted_ids) == 0:
+        return np.full(len(ids), -1, dtype=np.int64)
+    positions = np.clip(np.searchsorted(sorted_ids, ids), 0, len(sorted_ids) - 1)
+    return np.where(sorted_ids[positions] == ids, positions, -1)
+
+
+def _day_bins(day_ordinals: np.ndarray, start: date, num_days: int) -> np.ndarray:
+    """Bin ordinal days into the window.
+
+    Days before the window fall into bin 0 so they count towards the
+    starting totals, days after it fall into the overflow bin ``num_days``.
+    """
+    return np.clip(day_ordinals - start.toordinal(), 0, num_days).astype(np.int64)
+
+
+def compute_project_analytics(rows, statuses, priorities, start: date, end: date) -> Dict[str, Any]:
+    """Compute MTTR per priority, burn-down and cumulative flow for a project.
+
+    Args:
+        rows: Defects outer-joined with their status transitions, ordered by
+            defect id and transition time. Each row has ``id``, ``priority_id``,
+            ``status_id``, ``created_at``, ``closed_at``, ``transition_at``,
+            ``old_value`` and ``new_value``.
+        statuses: Defect statuses in display order
+        priorities: Priorities in display order
+        start: First day of the window
+        end: Last day of the window
+
+    Returns:
+        Dictionary with dates and the three series
+    """
+    num_days = (end - start).days + 1
+    dates = [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(num_days)]
+
+    status_ids = np.array(sorted(s.id for s in statuses), dtype=np.int64)
+    priority_ids = np.array(sorted(p.id for p in priorities), dtype=np.int64)
+
+    defect_ids = np.array([r.id for r in rows], dtype=np.int64)
+    first_row = np.ones(len(rows), dtype=bool)
+    first_row[1:] = defect_ids[1:] != defect_ids[:-1]
+    has_transition = np.array([r.transition_at is not None for r in rows], dtype=bool)
+
+    defect_rows = [r for r, first in zip(rows, first_row) if first]
+    transition_rows = [r for r, has in zip(rows, has_transition) if has]
+
+    # Per-defect columns
+    created_ts = np.array([r.created_at.timestamp() for r in defect_rows], dtype=np.float64)
+    created_day = np.array([r.created_at.date().toordinal() for r in defect_rows], dtype=np.int64)
+    closed_ts = np.array(
+        [r.closed_at.timestamp() if r.closed_at else np.nan for r in defect_rows], dtype=np.float64
+    )
+    closed_day = np.array(
+        [r.closed_at.date().toordinal() if r.closed_at else -1 for r in defect_rows], dtype=np.int64
+    )
+    current_status = np.array([r.status_id for r in defect_rows], dtype=np.int64)
+    priority_idx = _lookup_index(priority_ids, np.array([r.priority_id for r in defect_rows], dtype=np.int64))
+
+    # The status a defect was created in is the source of its first transition
+    first_has_transition = has_transition[first_row]
+    first_old_status = _parse_status_ids([r.old_value for r in defect_rows])
+    initial_status = np.where(
+        first_has_transition & (first_old_status >= 0), first_old_status, current_status
+    )
+
+    # Per-transition columns
+    transition_day = np.array(
+        [r.transition_at.date().toordinal() for r in transition_rows], dtype=np.int64
+    )
+    old_status_idx = _lookup_index(status_ids, _parse_status_ids([r.old_value for r in transition_rows]))
+    new_status_idx = _lookup_index(status_ids, _parse_status_ids([r.new_value for r in transition_rows]))
+
+    created_bins = _day_bins(created_day, start, num_days)
+    is_closed = closed_day >= 0
+    closed_bins = _day_bins(closed_day[is_closed], start, num_days)
+
+    # Burn-down: running totals of created and closed defects
+    created_total = np.cumsum(np.bincount(created_bins, minlength=num_days + 1)[:num_days])
+    closed_total = np.cumsum(np.bincount(closed_bins, minlength=num_days + 1)[:num_days])
+    open_total = created_total - closed_total
+
+    # Cumulative flow: +1 when a defect enters a status, -1 when it leaves it
+    flow = np.zeros((len(status_ids), num_days + 1), dtype=np.int64)
+    initial_idx = _lookup_index(status_ids, initial_status)
+    known = initial_idx >= 0
+    np.add.at(flow, (initial_idx[known], created_bins[known]), 1)
+
+    transition_bins = _day_bins(transition_day, start, num_days)
+    known = (old_status_idx >= 0) & (new_status_idx >= 0)
+    np.add.at(flow, (old_status_idx[known], transition_bins[known]), -1)
+    np.add.at(flow, (new_status_idx[known], transition_bins[known]), 1)
+    flow = np.cumsum(flow[:, :num_days], axis=1)
+
+    # MTTR: mean days from creation to closing for defects closed within the window
+    resolved = is_closed & (closed_day >= start.toordinal()) & (closed_day <= end.toordinal()) & (priority_idx >= 0)
+    resolve_days = (closed_ts[resolved] - created_ts[resolved]) / SECONDS_PER_DAY
+    resolved_count = np.bincount(priority_idx[resolved], minlength=len(priority_ids))
+    resolve_sum = np.bincount(priority_idx[resolved], weights=resolve_days, minlength=len(priority_ids))
+    mean_days = np.divide(
+        resolve_sum, resolved_count,
+        out=np.zeros(len(priority_ids), dtype=np.float64),
+        where=resolved_count > 0
+    )
+
+    priority_position = {pid: i for i, pid in enumerate(priority_ids.tolist())}
+    status_position = {sid: i for i, sid in enumerate(status_ids.tolist())}
+
+    return {
+        "dates": dates,
+        "mttr": [
+            {
+                "priority": p.name,
+                "priorityDisplay": p.display_name,
+                "meanDays": round(float(mean_days[priority_position[p.id]]), 2),
+                "resolved": int(resolved_count[priority_position[p.id]])
+            }
+            for p in priorities
+        ],
+        "burndown": {
+            "open": open_total.tolist(),
+            "closed": closed_total.tolist()
+        },
+        "cumulativeFlow": [
+            {
+                "status": s.name,
+                "statusDisplay": s.display_name,
+                "data": flow[status_position[s.id]].tolist()
+            }
+            for s in statuses
+        ]
+    }
+
+
+class DailyCache:
+    """Thread-safe cache whose entries are valid until the end of the day."""
+
+    def __init__(self):
+        """Initialize the cache."""
+        self._entries: Dict[Hashable, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get today's value for a key."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry[0] != date.today():
+            return None
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value for today, dropping entries from previous days."""
+        today = date.today()
+        with self._lock:
+            stale = [k for k, (day, _) in self._entries.items() if day != today]
+            for k in stale:
+                del self._entries[k]
+            self._entries[key] = (today, value)
+
+
+# Global analytics cache instance
+analytics_cache = DailyCache()
@@ -0,0 +1,31 @@
+"""Response compression that leaves Server-Sent Event streams alone."""
+
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import Headers
+from starlette.types import Receive, Scope, Send
+
+# Paths of the endpoints answering with text/event-stream
+EVENT_STREAM_PATH_SUFFIXES = ("/stream", "/events")
+
+
+def is_event_stream_request(scope: Scope) -> bool:
+    """Check whether a request will be answered with an event stream."""
+    if "text/event-stream" in Headers(scope=scope).get("accept", ""):
+        return True
+    return scope["path"].rstrip("/").endswith(EVENT_STREAM_PATH_SUFFIXES)
+
+
+class EventStreamAwareGZipMiddleware(GZipMiddleware):
+    """GZip middleware that never compresses event streams.
+
+    Some Starlette versions keep streamed chunks in the compressor until it
+    fills up, which holds small events back. Compression is decided before
+    the response starts, so streams are recognized by their request.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Pass event streams through uncompressed, compress everything else."""
+        if scope["type"] == "http" and is_event_stream_request(scope):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
@@ -35,6 +35,29 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
     
+    # Embed project roles in access tokens so permission checks skip the database
+    TOKEN_ROLE_CLAIMS: bool = True
+    
+    # Verified token cache
+    TOKEN_CACHE_MAXSIZE: int = 10000
+    
+    # How often each worker picks up tokens revoked by other workers
+    TOKEN_REVOCATION_REFRESH_SECONDS: int = 5
+    
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    
+    # Authenticated user cache
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAXSIZE: int = 10000
+    
+    # Report generation. Run the worker inside the API process, or set
+    # to False and start `python -m app.worker` separately
+    REPORT_WORKER_IN_PROCESS: bool = True
+    REPORT_WORKER_POLL_SECONDS: int = 5
+    
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = [
         "http://localhost:3000",
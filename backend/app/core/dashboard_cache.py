@@ -0,0 +1,129 @@
+"""Dashboard response cache invalidated by writes to project data."""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.defect import Defect
+from app.models.comment import Comment
+from app.models.change_log import ChangeLog
+
+logger = logging.getLogger(__name__)
+
+# Channel notified by the defects and comments write triggers
+DASHBOARD_CHANNEL = "dashboard"
+
+
+class DashboardCache:
+    """Per-project cache of dashboard responses.
+
+    Entries are dropped whenever data in their project is committed. Each
+    project has a generation counter so a response computed from data that
+    changed while it was being built is never stored.
+    """
+
+    def __init__(self, ttl: float = 300):
+        """Initialize the cache.
+
+        Args:
+            ttl: Safety-net lifetime in seconds for entries that were never invalidated
+        """
+        self.ttl = ttl
+        self._entries: Dict[int, Dict[Hashable, tuple]] = {}
+        self._generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get_or_compute(self, project_id: int, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for a key, computing and storing it on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(project_id, {}).get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generations.get(project_id, 0)
+
+        value = compute()
+
+        with self._lock:
+            if self._generations.get(project_id, 0) == generation:
+                self._entries.setdefault(project_id, {})[key] = (time.monotonic() + self.ttl, value)
+        return value
+
+    def invalidate_project(self, project_id: Optional[int]):
+        """Drop all entries of a project, or of every project if ``project_id`` is None."""
+        with self._lock:
+            self.invalidations += 1
+            if project_id is None:
+                for pid in set(self._entries) | set(self._generations):
+                    self._generations[pid] = self._generations.get(pid, 0) + 1
+                self._entries.clear()
+                return
+            self._generations[project_id] = self._generations.get(project_id, 0) + 1
+            self._entries.pop(project_id, None)
+
+    def on_notify(self, payload: Optional[str]):
+        """Handle a ``dashboard`` channel notification carrying the project id."""
+        if payload is None:
+            self.invalidate_project(None)
+            return
+        try:
+            self.invalidate_project(int(payload))
+        except ValueError:
+            logger.error(f"Invalid dashboard notification payload: {payload}")
+
+    def stats(self) -> dict:
+        """Get hit/miss statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "projects": len(self._entries),
+                "entries": sum(len(entries) for entries in self._entries.values())
+            }
+
+
+# Global dashboard cache instance
+dashboard_cache = DashboardCache()
+
+
+# Attachments are not tracked directly: every upload also writes a change log
+_TRACKED_MODELS = (Defect, Comment, ChangeLog)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_touched_projects(session: Session, flush_context):
+    """Remember which projects the flushed objects belong to."""
+    touched = session.info.setdefault("dashboard_touched_projects", set())
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(instance, _TRACKED_MODELS) and instance.project_id is not None:
+            touched.add(instance.project_id)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _invalidate_touched_projects(session: Session):
+    """Invalidate the projects written by a committed transaction right away.
+
+    Other workers learn about the change from the trigger notifications,
+    which do not depend on a change log being written.
+    """
+    for project_id in session.info.pop("dashboard_touched_projects", ()):
+        dashboard_cache.invalidate_project(project_id)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _forget_touched_projects(session: Session):
+    """Nothing was written, nothing needs invalidating."""
+    session.info.pop("dashboard_touched_projects", None)
@@ -1,14 +1,17 @@
 """Dependencies for FastAPI endpoints."""
 
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.db import get_db, SessionLocal
 from app.models.user import User
 from app.models.role import UserRole, Role
 from app.core.security import decode_access_token
+from app.core.user_cache import user_cache
+from app.core.token_revocation import revoked_tokens
 
 security = HTTPBearer()
 
@@ -29,6 +32,13 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    if revoked_tokens.is_revoked(payload.get("jti")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
     user_id_str: str = payload.get("sub")
     if user_id_str is None:
         raise HTTPException(
@@ -46,7 +56,7 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = user_cache.get_user(user_id, db)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -60,6 +70,8 @@ def get_current_user(
             detail="Inactive user"
         )
     
+    _use_token_role_claims(payload, user, db)
+    
     return user
 
 
@@ -81,7 +93,7 @@ def get_optional_current_user(
     try:
         token = credentials.credentials
         payload = decode_access_token(token)
-        if payload is None:
+        if payload is None or revoked_tokens.is_revoked(payload.get("jti")):
             return None
         
         user_id_str: str = payload.get("sub")
@@ -93,27 +105,126 @@ def get_optional_current_user(
         except (ValueError, TypeError):
             return None
         
-        user = db.query(User).filter(User.id == user_id, User.is_active == True).first()
-        return user
+        user = user_cache.get_user(user_id, db)
+        return user if user is not None and user.is_active else None
     except Exception:
         return None
 
 
+class ProjectRoleResolver:
+    """All project roles of one user, loaded with a single query.
+    
+    One resolver is kept per user in the session info, and sessions live for
+    one request, so repeated role checks in a request are in-memory lookups.
+    """
+    
+    def __init__(self, roles: Dict[int, List[str]]):
+        """Initialize the resolver.
+        
+        Args:
+            roles: Role names per project id, in the order they were granted
+        """
+        self._roles = roles
+        # Compiled permission bitmasks per project, filled by app.core.permissions
+        self.permission_masks: Dict[int, int] = {}
+    
+    @classmethod
+    def load(cls, user_id: int, db: Session) -> "ProjectRoleResolver":
+        """Load the user's (project_id, role name) pairs."""
+        rows = db.query(UserRole.project_id, Role.name).join(
+            Role, UserRole.role_id == Role.id
+        ).filter(
+            UserRole.user_id == user_id
+        ).order_by(UserRole.id).all()
+        
+        roles: Dict[int, List[str]] = {}
+        for project_id, role_name in rows:
+            roles.setdefault(project_id, []).append(role_name)
+        return cls(roles)
+    
+    @classmethod
+    def from_claims(cls, claims: Dict[str, List[str]]) -> "ProjectRoleResolver":
+        """Build a resolver from the ``roles`` claim of an access token."""
+        return cls({int(project_id): list(roles) for project_id, roles in claims.items()})
+    
+    def to_claims(self) -> Dict[str, List[str]]:
+        """Serialize the roles as a token claim (JSON object keys are strings)."""
+        return {str(project_id): roles for project_id, roles in self._roles.items()}
+    
+    def project_ids(self) -> List[int]:
+        """Get the ids of all projects the user has a role in."""
+        return list(self._roles)
+    
+    def roles_in_project(self, project_id: int) -> List[str]:
+        """Get all of the user's role names in a project."""
+        return self._roles.get(project_id, [])
+    
+    def role_in_project(self, project_id: int) -> Optional[str]:
+        """Get the user's (first granted) role name in a project."""
+        roles = self._roles.get(project_id)
+        return roles[0] if roles else None
+    
+    def has_role_in_project(self, project_id: int, role_names: list[str]) -> bool:
+        """Check if the user has one of the specified roles in a project."""
+        return any(role in role_names for role in self._roles.get(project_id, ()))
+
+
+def get_project_role_resolver(user_id: int, db: Session) -> ProjectRoleResolver:
+    """Get the session's role resolver for a user, loading it on first use."""
+    resolvers = db.info.setdefault("project_role_resolvers", {})
+    resolver = resolvers.get(user_id)
+    if resolver is None:
+        resolver = resolvers[user_id] = ProjectRoleResolver.load(user_id, db)
+    return resolver
+
+
+def get_token_role_claims(user: User, db: Session) -> Dict[str, Any]:
+    """Claims embedding the user's project roles and their permissions version."""
+    return {
+        "roles": get_project_role_resolver(user.id, db).to_claims(),
+        "pv": user.permissions_version
+    }
+
+
+def _use_token_role_claims(payload: Dict[str, Any], user: User, db: Session):
+    """Seed the request's role resolver from the token if its roles are current.
+    
+    Tokens issued before the user's roles last changed carry an outdated
+    permissions version; their claims are ignored and roles come from the
+    database until the client calls /auth/refresh.
+    """
+    claims = payload.get("roles")
+    if not isinstance(claims, dict) or payload.get("pv") != user.permissions_version:
+        return
+    try:
+        resolver = ProjectRoleResolver.from_claims(claims)
+    except (ValueError, TypeError):
+        return
+    db.info.setdefault("project_role_resolvers", {}).setdefault(user.id, resolver)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _forget_stale_role_resolvers(session: Session, flush_context):
+    """Reload roles after the session itself granted or revoked any."""
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(instance, UserRole):
+            session.info.pop("project_role_resolvers", None)
+            return
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _forget_role_resolvers_on_bulk_write(orm_execute_state):
+    """Bulk UPDATE/DELETE of user roles bypasses the flush."""
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        if any(mapper.class_ is UserRole for mapper in orm_execute_state.all_mappers):
+            orm_execute_state.session.info.pop("project_role_resolvers", None)
+
+
 def get_user_role_in_project(user_id: int, project_id: int, db: Session) -> Optional[str]:
     """Get user's role name in a project."""
-    user_role = db.query(UserRole, Role).join(
-        Role, UserRole.role_id == Role.id
-    ).filter(
-        UserRole.user_id == user_id,
-        UserRole.project_id == project_id
-    ).first()
-    
-    if user_role:
-        return user_role[1].name
-    return None
+    return get_project_role_resolver(user_id, db).role_in_project(project_id)
 
 
 def user_has_role_in_project(user_id: int, project_id: int, role_names: list[str], db: Session) -> bool:
     """Check if user has one of the specified roles in a project."""
-    user_role_name = get_user_role_in_project(user_id, project_id, db)
-    return user_role_name in role_names if user_role_name else False
+    return get_project_role_resolver(user_id, db).has_role_in_project(project_id, role_names)
@@ -0,0 +1,80 @@
+"""Short-lived, single-use tickets for downloading ad-hoc report exports.
+
+Browsers save a response to disk as it arrives only when they fetch it
+themselves, and then no Authorization header can be added. The client
+asks for a ticket with its access token, then lets the browser download
+the export by ticket. Only a hash of the ticket is stored.
+"""
+
+import hashlib
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import delete, func
+from sqlalchemy.orm import Session
+
+from app.models.report import ReportExportTicket
+
+# Time the client has to start the download
+EXPORT_TICKET_TTL_SECONDS = 60
+
+
+def _hash_ticket(ticket: str) -> str:
+    """Hash a ticket for storage."""
+    return hashlib.sha256(ticket.encode()).hexdigest()
+
+
+def issue_export_ticket(db: Session, created_by: int, params: dict) -> str:
+    """Store a ticket for exporting a report.
+
+    Args:
+        db: Database session, committed by this function
+        created_by: Id of the user the export is for
+        params: ReportCreate fields, as JSON-compatible values
+
+    Returns:
+        The ticket
+    """
+    ticket = secrets.token_urlsafe(32)
+    db.add(ReportExportTicket(
+        token_hash=_hash_ticket(ticket),
+        created_by=created_by,
+        params=params,
+        expires_at=datetime.now(timezone.utc) + timedelta(seconds=EXPORT_TICKET_TTL_SECONDS)
+    ))
+    db.commit()
+    return ticket
+
+
+def redeem_export_ticket(db: Session, ticket: str) -> Optional[Tuple[int, dict]]:
+    """Use up a ticket.
+
+    Deleting the row is what redeems it, so concurrent requests with the
+    same ticket cannot both succeed.
+
+    Returns:
+        The user id and report parameters, or None if the ticket is
+        unknown, used or expired
+    """
+    row = db.execute(
+        delete(ReportExportTicket).where(
+            ReportExportTicket.token_hash == _hash_ticket(ticket),
+            ReportExportTicket.expires_at > func.now()
+        ).returning(ReportExportTicket.created_by, ReportExportTicket.params)
+    ).first()
+    db.commit()
+    return (row.created_by, row.params) if row else None
+
+
+def purge_expired_export_tickets(db: Session) -> int:
+    """Delete tickets that were never redeemed.
+
+    Returns:
+        Number of deleted tickets
+    """
+    result = db.execute(
+        delete(ReportExportTicket).where(ReportExportTicket.expires_at <= func.now())
+    )
+    db.commit()
+    return result.rowcount
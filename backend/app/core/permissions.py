@@ -0,0 +1,173 @@
+"""Project permissions compiled from Role.permissions into bitmasks."""
+
+import threading
+import time
+from enum import IntFlag
+from typing import Dict, List, Optional
+
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.models.user import User
+from app.models.role import Role
+from app.core.deps import get_current_user, get_project_role_resolver
+
+
+class Permission(IntFlag):
+    """Actions a user may perform within a project."""
+    VIEW_PROJECT = 1 << 0
+    CREATE_DEFECTS = 1 << 1
+    EDIT_DEFECTS = 1 << 2
+    REVIEW_DEFECTS = 1 << 3
+    ASSIGN_DEFECTS = 1 << 4
+    VIEW_ALL_DEFECTS = 1 << 5
+    COMMENT = 1 << 6
+    MODERATE_COMMENTS = 1 << 7
+    VIEW_REPORTS = 1 << 8
+    CREATE_REPORTS = 1 << 9
+    MANAGE_PROJECT = 1 << 10
+
+
+ALL_PERMISSIONS = Permission(sum(Permission))
+
+# Grants of the permission keys seeded by init_db.py. Any other key that
+# names a Permission (e.g. "view_reports") grants just that permission.
+PERMISSION_GRANTS: Dict[str, Permission] = {
+    "create_defects": Permission.CREATE_DEFECTS | Permission.EDIT_DEFECTS | Permission.COMMENT,
+    "edit_own_defects": Permission.EDIT_DEFECTS | Permission.COMMENT,
+    "manage_defects": (
+        Permission.CREATE_DEFECTS | Permission.EDIT_DEFECTS | Permission.REVIEW_DEFECTS
+        | Permission.VIEW_ALL_DEFECTS | Permission.COMMENT | Permission.MODERATE_COMMENTS
+        | Permission.VIEW_REPORTS
+    ),
+    "assign_defects": Permission.ASSIGN_DEFECTS,
+    # Supervisors oversee the project but do not work on defects themselves
+    "full_access": (
+        Permission.VIEW_ALL_DEFECTS | Permission.VIEW_REPORTS | Permission.CREATE_REPORTS
+        | Permission.MANAGE_PROJECT
+    ),
+}
+
+# Roles are edited rarely, so compiled masks are reloaded at most this often
+ROLE_MASKS_TTL_SECONDS = 60
+
+
+def compile_permissions(permissions: Optional[dict]) -> Permission:
+    """Compile a Role.permissions JSON object into a bitmask.
+
+    Every role grants VIEW_PROJECT, since holding any role makes the user a
+    project member. Keys with a false value and unknown keys grant nothing.
+    """
+    mask = Permission.VIEW_PROJECT
+    for key, granted in (permissions or {}).items():
+        if not granted:
+            continue
+        if key in PERMISSION_GRANTS:
+            mask |= PERMISSION_GRANTS[key]
+        elif key.upper() in Permission.__members__:
+            mask |= Permission[key.upper()]
+    return mask
+
+
+class RoleMasks:
+    """Compiled permission masks of all roles, shared by all requests."""
+
+    def __init__(self, ttl: float = ROLE_MASKS_TTL_SECONDS):
+        """Initialize the registry.
+
+        Args:
+            ttl: Seconds after which roles are reloaded from the database
+        """
+        self.ttl = ttl
+        self._masks: Dict[str, Permission] = {}
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, role_name: str, db: Session) -> Permission:
+        """Get the mask of a role, reloading all roles if they are stale."""
+        if time.monotonic() >= self._expires_at:
+            self._load(db)
+        return self._masks.get(role_name, Permission(0))
+
+    def invalidate(self):
+        """Reload roles on next use."""
+        with self._lock:
+            self._expires_at = 0.0
+
+    def _load(self, db: Session):
+        """Compile the masks of every role."""
+        masks = {
+            name: compile_permissions(permissions)
+            for name, permissions in db.query(Role.name, Role.permissions).all()
+        }
+        with self._lock:
+            self._masks = masks
+            self._expires_at = time.monotonic() + self.ttl
+
+
+# Global role masks instance
+role_masks = RoleMasks()
+
+
+def get_project_permissions(user: User, project_id: int, db: Session) -> Permission:
+    """Get the permissions of a user in a project.
+
+    Masks are cached per project in the request's role resolver, so repeated
+    checks for the same (user, project) pair are a dictionary lookup.
+    """
+    if user.is_superuser:
+        return ALL_PERMISSIONS
+
+    resolver = get_project_role_resolver(user.id, db)
+    mask = resolver.permission_masks.get(project_id)
+    if mask is None:
+        mask = Permission(0)
+        for role_name in resolver.roles_in_project(project_id):
+            mask |= role_masks.get(role_name, db)
+        resolver.permission_masks[project_id] = mask
+    return mask
+
+
+def has_permission(user: User, project_id: int, permission: Permission, db: Session) -> bool:
+    """Check if a user has all of the given permissions in a project."""
+    return get_project_permissions(user, project_id, db) & permission == permission
+
+
+def get_projects_with_permission(user: User, permission: Permission, db: Session) -> List[int]:
+    """Get the projects in which the user holds a role granting a permission."""
+    resolver = get_project_role_resolver(user.id, db)
+    return [
+        project_id for project_id in resolver.project_ids()
+        if has_permission(user, project_id, permission, db)
+    ]
+
+
+def require(permission: Permission, detail: str = "Insufficient permissions"):
+    """Dependency factory checking a permission in the request's project.
+
+    The project is taken from the ``project_id`` path or query parameter.
+    The dependency returns the current user.
+    """
+    def dependency(
+        request: Request,
+        current_user: User = Depends(get_current_user),
+        db: Session = Depends(get_db)
+    ) -> User:
+        raw_project_id = request.path_params.get("project_id", request.query_params.get("project_id"))
+        try:
+            project_id = int(raw_project_id)
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="project_id is required"
+            )
+
+        if not has_permission(current_user, project_id, permission, db):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=detail
+            )
+        return current_user
+
+    return dependency
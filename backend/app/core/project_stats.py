@@ -0,0 +1,108 @@
+"""Maintenance of the denormalized statistics columns on projects.
+
+Statistics are not edits of the project, so every update keeps
+``updated_at`` as it is instead of letting its onupdate default fire.
+"""
+
+import logging
+
+from sqlalchemy import func, select, update, or_
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.models.defect import Defect
+from app.models.role import UserRole
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+def _defects_count_of(project_id):
+    """Subquery counting a project's defects."""
+    return select(func.count(Defect.id)).where(
+        Defect.project_id == project_id
+    ).scalar_subquery()
+
+
+def _last_defect_date_of(project_id):
+    """Subquery for the creation time of a project's newest defect."""
+    return select(func.max(Defect.created_at)).where(
+        Defect.project_id == project_id
+    ).scalar_subquery()
+
+
+def _team_size_of(project_id):
+    """Subquery counting a project's members, excluding superusers."""
+    return select(func.count(func.distinct(UserRole.user_id))).join(
+        User, UserRole.user_id == User.id
+    ).where(
+        UserRole.project_id == project_id,
+        User.is_superuser == False
+    ).scalar_subquery()
+
+
+def record_defect_created(db: Session, project_id: int):
+    """Account for a defect created in the current transaction.
+
+    The defect's created_at defaults to now(), the transaction start time,
+    so the same expression gives the new last_defect_date.
+    """
+    db.execute(
+        update(Project).where(Project.id == project_id).values(
+            defects_count=Project.defects_count + 1,
+            last_defect_date=func.now(),
+            updated_at=Project.updated_at
+        ).execution_options(synchronize_session=False)
+    )
+
+
+def record_defect_deleted(db: Session, project_id: int):
+    """Account for a defect deleted (and flushed) in the current transaction."""
+    db.execute(
+        update(Project).where(Project.id == project_id).values(
+            defects_count=Project.defects_count - 1,
+            last_defect_date=_last_defect_date_of(project_id),
+            updated_at=Project.updated_at
+        ).execution_options(synchronize_session=False)
+    )
+
+
+def refresh_team_size(db: Session, project_id: int):
+    """Recount project members after its user roles changed (and were flushed)."""
+    db.execute(
+        update(Project).where(Project.id == project_id).values(
+            team_size=_team_size_of(project_id),
+            updated_at=Project.updated_at
+        ).execution_options(synchronize_session=False)
+    )
+
+
+def reconcile_project_stats(db: Session) -> int:
+    """Recompute statistics of every project and fix any drift.
+
+    Returns:
+        Number of projects whose statistics were corrected
+    """
+    defects_count = _defects_count_of(Project.id)
+    team_size = _team_size_of(Project.id)
+    last_defect_date = _last_defect_date_of(Project.id)
+
+    result = db.execute(
+        update(Project).where(
+            or_(
+                Project.defects_count != defects_count,
+                Project.team_size != team_size,
+                Project.last_defect_date.is_distinct_from(last_defect_date)
+            )
+        ).values(
+            defects_count=defects_count,
+            team_size=team_size,
+            last_defect_date=last_defect_date,
+            updated_at=Project.updated_at
+        ).execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    if result.rowcount:
+        logger.warning(f"Corrected statistics of {result.rowcount} project(s)")
+    return result.rowcount
@@ -0,0 +1,158 @@
+"""Content-addressed cache of generated report files.
+
+A report file depends only on its projects, its format, the template
+version and the data it was built from. These are hashed into a cache key.
+Reports with the same key share one artifact file. The database counts the
+reports referencing each artifact, and unreferenced files are purged.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Callable, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.report_generation import REPORT_TEMPLATE_VERSION, generate_report_file
+from app.models.project import Project
+from app.models.report import Report, ReportArtifact
+
+logger = logging.getLogger(__name__)
+
+
+def report_cache_key(db: Session, params: dict) -> str:
+    """Hash report parameters and the data versions of the projects they cover.
+
+    Triggers bump a project's version in the writing transaction whenever
+    anything its reports print changes: its defects, its name, and the names
+    of assignees, statuses and priorities its defects use. The bump locks
+    the project row, so versions follow commit order and a version never
+    becomes visible before the data it covers.
+    """
+    project_ids = sorted(set(params["project_ids"]))
+
+    data_versions = db.query(Project.id, Project.data_version).filter(
+        Project.id.in_(project_ids)
+    ).order_by(Project.id).all()
+
+    material = json.dumps({
+        "project_ids": project_ids,
+        "multi_project": params["multi_project"],
+        "format": params["format"],
+        "template_version": REPORT_TEMPLATE_VERSION,
+        "data_versions": [[project_id, version] for project_id, version in data_versions]
+    }, sort_keys=True)
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+def find_artifact(db: Session, cache_key: str) -> Optional[ReportArtifact]:
+    """Get the artifact of a cache key.
+
+    The row stays locked until the transaction ends, so the artifact cannot
+    be purged before a report referencing it is committed.
+    """
+    return db.query(ReportArtifact).filter(
+        ReportArtifact.cache_key == cache_key
+    ).with_for_update().first()
+
+
+def store_artifact(db: Session, cache_key: str, report_format: str, file_path: str) -> ReportArtifact:
+    """Register a generated file under its cache key.
+
+    If another worker stored the same key first, its artifact is used and
+    the new file is removed.
+    """
+    artifact_id = db.execute(
+        insert(ReportArtifact).values(
+            cache_key=cache_key,
+            format=report_format,
+            file_path=file_path,
+            file_size=os.path.getsize(file_path)
+        ).on_conflict_do_nothing(
+            index_elements=[ReportArtifact.cache_key]
+        ).returning(ReportArtifact.id)
+    ).scalar()
+
+    if artifact_id is None:
+        os.remove(file_path)
+        return find_artifact(db, cache_key)
+    return db.get(ReportArtifact, artifact_id)
+
+
+def create_report_for_artifact(db: Session, artifact: ReportArtifact, created_by: int, params: dict) -> Report:
+    """Add a report row using an artifact's file. The report is flushed but not committed."""
+    project_ids = params["project_ids"]
+    is_multi_project = params["multi_project"]
+
+    db_report = Report(
+        project_id=project_ids[0] if not is_multi_project else None,
+        project_ids=project_ids if is_multi_project else None,
+        created_by=created_by,
+        title=params["title"],
+        description=params.get("description"),
+        format=params["format"],
+        file_path=artifact.file_path,
+        file_size=artifact.file_size,
+        artifact_id=artifact.id
+    )
+    db.add(db_report)
+    db.flush()
+    return db_report
+
+
+def get_cached_report(db: Session, created_by: int, params: dict) -> Optional[Report]:
+    """Add a report for an up-to-date cached file, if there is one."""
+    artifact = find_artifact(db, report_cache_key(db, params))
+    if artifact is None:
+        return None
+    return create_report_for_artifact(db, artifact, created_by, params)
+
+
+def build_report(
+    db: Session,
+    created_by: int,
+    params: dict,
+    on_progress: Optional[Callable[[int], None]] = None
+) -> Report:
+    """Add a report, generating its file only if no cached file is up to date.
+
+    The key is computed before any row is read, so a file never holds data
+    older than its key says.
+    """
+    cache_key = report_cache_key(db, params)
+    artifact = find_artifact(db, cache_key)
+
+    if artifact is None:
+        file_path = generate_report_file(db, params, on_progress)
+        try:
+            artifact = store_artifact(db, cache_key, params["format"], file_path)
+        except Exception:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            raise
+    else:
+        logger.info(f"Reusing cached report file {artifact.file_path}")
+
+    return create_report_for_artifact(db, artifact, created_by, params)
+
+
+def purge_unreferenced_artifacts(db: Session) -> int:
+    """Delete artifacts no report refers to, along with their files.
+
+    Returns:
+        Number of artifacts purged
+    """
+    file_paths = db.execute(
+        delete(ReportArtifact).where(
+            ReportArtifact.ref_count <= 0
+        ).returning(ReportArtifact.file_path)
+    ).scalars().all()
+    db.commit()
+
+    for file_path in file_paths:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+    return len(file_paths)
@@ -0,0 +1,330 @@
+"""Report file generation, shared by the report worker and the API."""
+
+import csv
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, PatternFill
+from openpyxl.utils import get_column_letter
+from sqlalchemy import String, case, cast, func
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.models.defect import Defect, DefectStatus, Priority
+from app.models.project import Project
+
+logger = logging.getLogger(__name__)
+
+REPORTS_DIR = "reports"
+os.makedirs(REPORTS_DIR, exist_ok=True)
+
+# Part of every report cache key. Bump it whenever the content or layout
+# of generated files changes, so files built by older code are not reused.
+REPORT_TEMPLATE_VERSION = 1
+
+# Rows written between two progress callbacks
+PROGRESS_INTERVAL_ROWS = 1000
+
+# Rows fetched from the database at a time while writing a report
+FETCH_BATCH_SIZE = 1000
+
+# Widest column in Excel reports, in characters
+MAX_COLUMN_WIDTH = 50
+
+UNASSIGNED = "Не назначен"
+DATE_FORMAT = '%d.%m.%Y'
+DATETIME_FORMAT = '%d.%m.%Y %H:%M'
+DATE_LENGTH = len(datetime(2000, 1, 1).strftime(DATE_FORMAT))
+DATETIME_LENGTH = len(datetime(2000, 1, 1).strftime(DATETIME_FORMAT))
+
+
+def build_defects_query(db: Session, project_ids: List[int]):
+    """Query the defect rows of a report."""
+    return db.query(
+        Defect.id,
+        Defect.project_id,
+        Defect.title,
+        Defect.description,
+        Defect.location,
+        DefectStatus.display_name.label('status'),
+        Priority.display_name.label('priority'),
+        User.first_name,
+        User.last_name,
+        Defect.due_date,
+        Defect.created_at,
+        Defect.updated_at,
+        Project.name.label('project_name')
+    ).join(
+        DefectStatus, Defect.status_id == DefectStatus.id
+    ).join(
+        Priority, Defect.priority_id == Priority.id
+    ).join(
+        Project, Defect.project_id == Project.id
+    ).outerjoin(
+        User, Defect.assignee_id == User.id
+    ).filter(
+        Defect.project_id.in_(project_ids)
+    )
+
+
+def generate_report_file(
+    db: Session,
+    params: dict,
+    on_progress: Optional[Callable[[int], None]] = None
+) -> str:
+    """Generate a report file in REPORTS_DIR.
+
+    Args:
+        db: Database session
+        params: ReportCreate fields, with ``project_ids`` always set and
+            ``multi_project`` telling whether the report spans several projects
+        on_progress: Called with the percentage of rows written so far
+
+    Returns:
+        Path of the generated file
+    """
+    project_ids = params["project_ids"]
+    is_multi_project = params["multi_project"]
+
+    projects = db.query(Project).filter(Project.id.in_(project_ids)).all()
+    if len(projects) != len(set(project_ids)):
+        raise ValueError("Some of the report projects no longer exist")
+    projects.sort(key=lambda p: project_ids.index(p.id))
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    file_extension = 'xlsx' if params["format"] == 'excel' else 'csv'
+
+    if is_multi_project:
+        project_ids_str = "_".join(map(str, sorted(project_ids)))
+        filename = f"report_multi_{project_ids_str}_{timestamp}.{file_extension}"
+    else:
+        filename = f"report_{project_ids[0]}_{timestamp}.{file_extension}"
+
+    file_path = os.path.join(REPORTS_DIR, filename)
+
+    try:
+        defects_query = build_defects_query(db, project_ids)
+        total = db.query(func.count(Defect.id)).filter(Defect.project_id.in_(project_ids)).scalar()
+
+        if is_multi_project:
+            project_names = ", ".join([p.name for p in projects])
+            report_title = f"Multi-Project Report: {project_names}"
+        else:
+            report_title = projects[0].name
+
+        if params["format"] == 'csv':
+            started = time.monotonic()
+            defects_data = _track_progress(stream_rows(db, defects_query), total, on_progress)
+            rows_written = _generate_csv_report(file_path, defects_data, is_multi_project)
+            elapsed = time.monotonic() - started
+            logger.info(
+                f"Wrote {rows_written} rows to {file_path} in {elapsed:.1f}s "
+                f"({rows_written / max(elapsed, 0.001):.0f} rows/s)"
+            )
+        else:  # EXCEL
+            column_lengths = measure_columns(db, project_ids, is_multi_project)
+            defects_data = _track_progress(defects_query.yield_per(FETCH_BATCH_SIZE), total, on_progress)
+            _generate_excel_report(file_path, defects_data, report_title, is_multi_project, column_lengths)
+
+        return file_path
+
+    except Exception:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+
+
+def stream_rows(db: Session, query, batch_size: int = FETCH_BATCH_SIZE) -> Iterator:
+    """Yield the rows of a query from a server-side cursor.
+
+    Rows are fetched ``batch_size`` at a time, so memory use does not grow
+    with the size of the result.
+    """
+    result = db.execute(
+        query.statement.execution_options(stream_results=True, max_row_buffer=batch_size)
+    )
+    try:
+        for batch in result.partitions(batch_size):
+            yield from batch
+    finally:
+        result.close()
+
+
+def _track_progress(rows: Iterable, total: int, on_progress: Optional[Callable[[int], None]]):
+    """Pass rows through, reporting the percentage consumed every few rows."""
+    if on_progress is None:
+        yield from rows
+        return
+
+    count = 0
+    for row in rows:
+        yield row
+        count += 1
+        if count % PROGRESS_INTERVAL_ROWS == 0 and total:
+            on_progress(min(99, count * 100 // total))
+
+
+def measure_columns(db: Session, project_ids: List[int], is_multi_project: bool) -> List[int]:
+    """Get the length of the longest value of every report column.
+
+    Write-only worksheets store column widths ahead of the rows, so the
+    lengths are measured by one aggregate query before writing starts.
+    """
+    assignee_length = case(
+        (
+            func.coalesce(User.first_name, '') != '',
+            func.length(User.first_name) + 1 + func.coalesce(func.length(User.last_name), 4)
+        ),
+        else_=len(UNASSIGNED)
+    )
+
+    lengths = build_defects_query(db, project_ids).with_entities(
+        func.max(func.length(cast(Defect.id, String))).label('id'),
+        func.max(func.length(Project.name)).label('project_name'),
+        func.max(func.length(Defect.title)).label('title'),
+        func.max(func.length(Defect.description)).label('description'),
+        func.max(func.length(Defect.location)).label('location'),
+        func.max(func.length(DefectStatus.display_name)).label('status'),
+        func.max(func.length(Priority.display_name)).label('priority'),
+        func.max(assignee_length).label('assignee'),
+        func.count(Defect.due_date).label('due_dates'),
+        func.count(Defect.id).label('defects'),
+        func.count(Defect.updated_at).label('updates')
+    ).one()
+
+    result = [lengths.id]
+    if is_multi_project:
+        result.append(lengths.project_name)
+    result.extend([
+        lengths.title,
+        lengths.description,
+        lengths.location,
+        lengths.status,
+        lengths.priority,
+        lengths.assignee,
+        DATE_LENGTH if lengths.due_dates else 0,
+        DATETIME_LENGTH if lengths.defects else 0,
+        DATETIME_LENGTH if lengths.updates else 0
+    ])
+    return [length or 0 for length in result]
+
+
+def report_headers(is_multi_project: bool) -> List[str]:
+    """Column headers of a report."""
+    headers = ['ID']
+    if is_multi_project:
+        headers.append('Проект')
+    headers.extend([
+        'Название',
+        'Описание',
+        'Местоположение',
+        'Статус',
+        'Приоритет',
+        'Исполнитель',
+        'Срок выполнения',
+        'Дата создания',
+        'Дата обновления'
+    ])
+    return headers
+
+
+def report_row(defect, is_multi_project: bool) -> list:
+    """Format a defect row of ``build_defects_query`` as report values."""
+    assignee = f"{defect.first_name} {defect.last_name}" if defect.first_name else UNASSIGNED
+
+    row = [defect.id]
+    if is_multi_project:
+        row.append(defect.project_name)
+    row.extend([
+        defect.title,
+        defect.description,
+        defect.location,
+        defect.status,
+        defect.priority,
+        assignee,
+        defect.due_date.strftime(DATE_FORMAT) if defect.due_date else '',
+        defect.created_at.strftime(DATETIME_FORMAT),
+        defect.updated_at.strftime(DATETIME_FORMAT) if defect.updated_at else ''
+    ])
+    return row
+
+
+def _generate_csv_report(file_path: str, defects_data, is_multi_project=False) -> int:
+    """Generate CSV report with optional project column for multi-project reports.
+
+    Returns:
+        Number of defect rows written
+    """
+    rows_written = 0
+    with open(file_path, 'w', newline='', encoding='utf-8-sig') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(report_headers(is_multi_project))
+
+        for defect in defects_data:
+            writer.writerow(report_row(defect, is_multi_project))
+            rows_written += 1
+
+    return rows_written
+
+
+def _generate_excel_report(
+    file_path: str,
+    defects_data,
+    report_title: str,
+    is_multi_project=False,
+    column_lengths: Optional[List[int]] = None
+):
+    """Generate Excel report with optional project column for multi-project reports.
+
+    The workbook is write-only, so rows go to the file as they are appended
+    and memory use does not grow with the number of defects.
+
+    Args:
+        file_path: Path to save the workbook to
+        defects_data: Rows of ``build_defects_query``
+        report_title: Title shown above the table
+        is_multi_project: Whether to add the project column
+        column_lengths: Longest value of every column, see ``measure_columns``
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Defects")
+
+    headers = report_headers(is_multi_project)
+    column_lengths = column_lengths or [0] * len(headers)
+
+    # Column and row formatting must be set before the first row is written
+    for col_num, header in enumerate(headers, 1):
+        max_length = max(len(header), column_lengths[col_num - 1])
+        ws.column_dimensions[get_column_letter(col_num)].width = min(max_length + 2, MAX_COLUMN_WIDTH)
+
+    ws.merged_cells.add(f'A1:{get_column_letter(len(headers))}1')
+    ws.row_dimensions[1].height = 30
+    ws.row_dimensions[2].height = 5
+
+    title_cell = WriteOnlyCell(ws, value=f"Отчет по дефектам - {report_title}")
+    title_cell.font = Font(size=14, bold=True)
+    title_cell.alignment = Alignment(horizontal='center', vertical='center')
+    ws.append([title_cell])
+    ws.append([])
+
+    header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
+    header_font = Font(color='FFFFFF', bold=True)
+
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal='center')
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    for defect in defects_data:
+        ws.append(report_row(defect, is_multi_project))
+
+    wb.save(file_path)
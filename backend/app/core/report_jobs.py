@@ -0,0 +1,277 @@
+"""Report generation queue stored in PostgreSQL.
+
+Jobs are rows of ``report_jobs``. Creating one sends a NOTIFY on the
+``report_jobs`` channel; workers LISTEN on it and claim queued jobs with
+``FOR UPDATE SKIP LOCKED``, so any number of workers can share the queue.
+Workers also poll, so a missed notification only delays a job.
+"""
+
+import logging
+import select
+import threading
+import time
+from datetime import timedelta
+from typing import Optional
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.report_cache import build_report, get_cached_report
+from app.db.session import SessionLocal
+from app.models.report import ReportJob
+
+logger = logging.getLogger(__name__)
+
+# Channel notified when a job is queued
+CHANNEL = "report_jobs"
+
+# Workers renew the lease of their running job this often
+HEARTBEAT_SECONDS = 15
+
+# Running jobs without a heartbeat for this long belong to a worker that died
+JOB_LEASE_SECONDS = 60
+
+# Delay before reconnecting a lost listener connection
+RECONNECT_DELAY_SECONDS = 5
+
+
+def enqueue_report_job(db: Session, created_by: int, params: dict) -> ReportJob:
+    """Queue a report and wake up a worker.
+
+    If an up-to-date file of the report is cached, the job is completed
+    right away and no worker is involved.
+
+    Args:
+        db: Database session, committed by this function
+        created_by: Id of the user requesting the report
+        params: Report parameters, see ``generate_report_file``
+
+    Returns:
+        The queued or completed job
+    """
+    job = ReportJob(created_by=created_by, params=params)
+
+    report = get_cached_report(db, created_by, params)
+    if report is not None:
+        job.status = "completed"
+        job.progress = 100
+        job.report_id = report.id
+        job.started_at = func.now()
+        job.finished_at = func.now()
+        db.add(job)
+    else:
+        db.add(job)
+        db.flush()
+        # Delivered to listeners when the transaction commits
+        db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": str(job.id)})
+
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def claim_next_job(db: Session) -> Optional[int]:
+    """Mark the oldest queued job as running.
+
+    Returns:
+        Id of the claimed job, or None if the queue is empty
+    """
+    job = db.query(ReportJob).filter(
+        ReportJob.status == "queued"
+    ).order_by(ReportJob.id).with_for_update(skip_locked=True).first()
+
+    if job is None:
+        db.rollback()
+        return None
+
+    job_id = job.id
+    job.status = "running"
+    job.started_at = func.now()
+    job.heartbeat_at = func.now()
+    db.commit()
+    return job_id
+
+
+def run_report_job(job_id: int):
+    """Generate the report of a claimed job and record the outcome."""
+    heartbeat_stop = threading.Event()
+    heartbeat = threading.Thread(
+        target=_send_heartbeats, args=(job_id, heartbeat_stop), name=f"report-job-{job_id}-heartbeat", daemon=True
+    )
+    heartbeat.start()
+
+    db = SessionLocal()
+    try:
+        job = db.get(ReportJob, job_id)
+        report = build_report(
+            db, job.created_by, job.params,
+            on_progress=lambda percent: _set_progress(job_id, percent)
+        )
+        job.status = "completed"
+        job.progress = 100
+        job.report_id = report.id
+        job.finished_at = func.now()
+        db.commit()
+        logger.info(f"Report job {job_id} completed, report {report.id}")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Report job {job_id} failed: {str(e)}")
+        db.query(ReportJob).filter(ReportJob.id == job_id).update({
+            ReportJob.status: "failed",
+            ReportJob.error: str(e),
+            ReportJob.finished_at: func.now()
+        }, synchronize_session=False)
+        db.commit()
+    finally:
+        heartbeat_stop.set()
+        heartbeat.join()
+        db.close()
+
+
+def fail_stale_jobs(db: Session) -> int:
+    """Fail running jobs whose lease expired because their worker stopped.
+
+    Returns:
+        Number of jobs failed
+    """
+    count = db.query(ReportJob).filter(
+        ReportJob.status == "running",
+        ReportJob.heartbeat_at < func.now() - timedelta(seconds=JOB_LEASE_SECONDS)
+    ).update({
+        ReportJob.status: "failed",
+        ReportJob.error: "The report worker stopped before the report was finished",
+        ReportJob.finished_at: func.now()
+    }, synchronize_session=False)
+    db.commit()
+    return count
+
+
+def _send_heartbeats(job_id: int, stop: threading.Event):
+    """Renew the lease of a running job until ``stop`` is set."""
+    while not stop.wait(HEARTBEAT_SECONDS):
+        db = SessionLocal()
+        try:
+            db.query(ReportJob).filter(ReportJob.id == job_id).update(
+                {ReportJob.heartbeat_at: func.now()}, synchronize_session=False
+            )
+            db.commit()
+        except Exception as e:
+            logger.error(f"Error renewing lease of report job {job_id}: {str(e)}")
+        finally:
+            db.close()
+
+
+def _set_progress(job_id: int, percent: int):
+    """Store job progress in its own transaction, so it is visible right away."""
+    db = SessionLocal()
+    try:
+        db.query(ReportJob).filter(ReportJob.id == job_id).update(
+            {ReportJob.progress: percent}, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+class ReportWorker:
+    """Processes queued report jobs one at a time."""
+
+    def __init__(self, poll_interval: float = settings.REPORT_WORKER_POLL_SECONDS):
+        """Initialize the worker.
+
+        Args:
+            poll_interval: Seconds to wait for a notification before checking the queue anyway
+        """
+        self.poll_interval = poll_interval
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._connection = None
+        self._next_stale_check = 0.0
+
+    def start(self):
+        """Run the worker on a background thread of the current process."""
+        if self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self.run, name="report-worker", daemon=True)
+            self._thread.start()
+            logger.info("Report worker started")
+
+    def stop(self):
+        """Stop after the job in progress, if any."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+            self._thread = None
+            logger.info("Report worker stopped")
+
+    def run(self):
+        """Process jobs until ``stop`` is called."""
+        while not self._stopping.is_set():
+            try:
+                self._connect()
+                while not self._stopping.is_set():
+                    self._fail_stale_jobs()
+                    self._drain_queue()
+                    self._wait_for_jobs()
+            except Exception as e:
+                logger.error(f"Report worker error: {str(e)}")
+                self._stopping.wait(RECONNECT_DELAY_SECONDS)
+            finally:
+                self._close()
+
+    def _connect(self):
+        """Open the LISTEN connection."""
+        self._connection = psycopg2.connect(str(settings.DATABASE_URL))
+        self._connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with self._connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+
+    def _close(self):
+        """Close the LISTEN connection."""
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+    def _fail_stale_jobs(self):
+        """Fail jobs left running by a dead worker, at most once per lease period."""
+        if time.monotonic() < self._next_stale_check:
+            return
+        self._next_stale_check = time.monotonic() + JOB_LEASE_SECONDS
+
+        db = SessionLocal()
+        try:
+            failed = fail_stale_jobs(db)
+            if failed:
+                logger.warning(f"Failed {failed} stale report job(s)")
+        finally:
+            db.close()
+
+    def _drain_queue(self):
+        """Run queued jobs until the queue is empty."""
+        while not self._stopping.is_set():
+            db = SessionLocal()
+            try:
+                job_id = claim_next_job(db)
+            finally:
+                db.close()
+
+            if job_id is None:
+                return
+            run_report_job(job_id)
+
+    def _wait_for_jobs(self):
+        """Block until a job is queued or the poll interval elapses."""
+        readable, _, _ = select.select([self._connection], [], [], self.poll_interval)
+        if readable:
+            self._connection.poll()
+            self._connection.notifies.clear()
+
+
+# Global report worker instance
+report_worker = ReportWorker()
@@ -0,0 +1,247 @@
+"""Reports generated straight into an HTTP response, without a stored file.
+
+CSV is encoded in chunks as rows come off the server-side cursor. XLSX is
+written as a zip stream. openpyxl buffers worksheets in temporary files
+and only writes the archive on save, so the few workbook parts are
+produced here directly.
+"""
+
+import csv
+import io
+import re
+import zipfile
+from typing import Iterator, List, Optional
+from xml.sax.saxutils import escape
+
+from openpyxl.utils import get_column_letter
+
+from app.core.report_generation import (
+    FETCH_BATCH_SIZE, MAX_COLUMN_WIDTH, build_defects_query, measure_columns, report_headers, report_row, stream_rows
+)
+from app.db.session import SessionLocal
+
+# Bytes collected before a chunk is sent to the client
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Characters not allowed in XML 1.0 documents
+_ILLEGAL_XML_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Defects" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_WORKBOOK_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+# Cell styles 1 and 2 match the title and header of stored Excel reports
+_TITLE_STYLE = 1
+_HEADER_STYLE = 2
+_STYLES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="3">'
+    '<font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="14"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><color rgb="00FFFFFF"/><name val="Calibri"/></font>'
+    '</fonts>'
+    '<fills count="3">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="004472C4"/><bgColor rgb="004472C4"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center"/></xf>'
+    '<xf numFmtId="0" fontId="2" fillId="2" borderId="0" xfId="0" applyFont="1" applyFill="1" applyAlignment="1">'
+    '<alignment horizontal="center"/></xf>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+
+class _ChunkSink:
+    """Write-only file object whose contents are taken out in chunks."""
+
+    def __init__(self):
+        """Initialize an empty sink."""
+        self._buffer = bytearray()
+
+    def write(self, data: bytes) -> int:
+        """Collect written bytes."""
+        self._buffer.extend(data)
+        return len(data)
+
+    def flush(self):
+        """Nothing to flush, bytes are taken out with ``drain``."""
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def drain(self) -> bytes:
+        """Take out everything written so far."""
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def stream_csv_report(project_ids: List[int], is_multi_project: bool) -> Iterator[bytes]:
+    """Yield a CSV report in chunks.
+
+    The header is sent before the defect query runs, so the first byte does
+    not wait for the database.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # Same byte order mark as the utf-8-sig encoded stored reports
+    buffer.write('\ufeff')
+    writer.writerow(report_headers(is_multi_project))
+    yield _drain_text(buffer)
+
+    db = SessionLocal()
+    try:
+        for defect in stream_rows(db, build_defects_query(db, project_ids)):
+            writer.writerow(report_row(defect, is_multi_project))
+            if buffer.tell() >= STREAM_CHUNK_SIZE:
+                yield _drain_text(buffer)
+        yield _drain_text(buffer)
+    finally:
+        db.close()
+
+
+def stream_excel_report(project_ids: List[int], report_title: str, is_multi_project: bool) -> Iterator[bytes]:
+    """Yield an XLSX report as a zip stream.
+
+    Matches the layout of stored Excel reports: a merged title row, a
+    spacer row, styled headers and column widths fitted to the content.
+    """
+    sink = _ChunkSink()
+    headers = report_headers(is_multi_project)
+    last_column = get_column_letter(len(headers))
+
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', _CONTENT_TYPES_XML)
+        archive.writestr('_rels/.rels', _ROOT_RELS_XML)
+        archive.writestr('xl/workbook.xml', _WORKBOOK_XML)
+        archive.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS_XML)
+        archive.writestr('xl/styles.xml', _STYLES_XML)
+        yield sink.drain()
+
+        db = SessionLocal()
+        try:
+            column_lengths = measure_columns(db, project_ids, is_multi_project)
+
+            with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+                sheet.write(_sheet_head(headers, column_lengths, report_title).encode('utf-8'))
+
+                rows = []
+                for row_num, defect in enumerate(stream_rows(db, build_defects_query(db, project_ids)), 4):
+                    rows.append(_row_xml(row_num, report_row(defect, is_multi_project)))
+                    if len(rows) == FETCH_BATCH_SIZE:
+                        sheet.write(''.join(rows).encode('utf-8'))
+                        rows = []
+                        if len(sink) >= STREAM_CHUNK_SIZE:
+                            yield sink.drain()
+
+                sheet.write(''.join(rows).encode('utf-8'))
+                sheet.write(
+                    f'</sheetData><mergeCells count="1"><mergeCell ref="A1:{last_column}1"/></mergeCells>'
+                    '</worksheet>'.encode('utf-8')
+                )
+        finally:
+            db.close()
+
+    yield sink.drain()
+
+
+def _drain_text(buffer: io.StringIO) -> bytes:
+    """Take the text out of a buffer, encoded for the response."""
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return data.encode('utf-8')
+
+
+def _sheet_head(headers: List[str], column_lengths: List[int], report_title: str) -> str:
+    """Worksheet XML up to and including the header row."""
+    cols = ''.join(
+        f'<col min="{col_num}" max="{col_num}" '
+        f'width="{min(max(len(header), length) + 2, MAX_COLUMN_WIDTH)}" customWidth="1"/>'
+        for col_num, (header, length) in enumerate(zip(headers, column_lengths), 1)
+    )
+    header_cells = ''.join(
+        _cell_xml(f'{get_column_letter(col_num)}3', header, _HEADER_STYLE)
+        for col_num, header in enumerate(headers, 1)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        f'<cols>{cols}</cols><sheetData>'
+        '<row r="1" ht="30" customHeight="1">'
+        f'{_cell_xml("A1", f"Отчет по дефектам - {report_title}", _TITLE_STYLE)}</row>'
+        '<row r="2" ht="5" customHeight="1"/>'
+        f'<row r="3">{header_cells}</row>'
+    )
+
+
+def _row_xml(row_num: int, values: list) -> str:
+    """Worksheet XML of a data row."""
+    cells = ''.join(
+        _cell_xml(f'{get_column_letter(col_num)}{row_num}', value)
+        for col_num, value in enumerate(values, 1)
+    )
+    return f'<row r="{row_num}">{cells}</row>'
+
+
+def _cell_xml(ref: str, value, style: Optional[int] = None) -> str:
+    """Worksheet XML of a cell; empty values produce no cell."""
+    if value is None or value == '':
+        return ''
+
+    style_attr = f' s="{style}"' if style else ''
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f'<c r="{ref}"{style_attr}><v>{value}</v></c>'
+
+    text = _ILLEGAL_XML_CHARS.sub('', str(value))
+    space = ' xml:space="preserve"' if text != text.strip() else ''
+    return f'<c r="{ref}"{style_attr} t="inlineStr"><is><t{space}>{escape(text)}</t></is></c>'
@@ -1,14 +1,27 @@
 """Scheduler for automated tasks."""
 
 import logging
+from datetime import datetime
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.triggers.cron import CronTrigger
 from fastapi import FastAPI
 
 from app.core.backup import backup_service
+from app.core.activity_stream import activity_stream
+from app.core.dashboard_cache import dashboard_cache, DASHBOARD_CHANNEL
+from app.core.user_cache import user_cache, USER_CHANNEL
+from app.core.project_stats import reconcile_project_stats
+from app.core.security import password_hasher
+from app.core.token_revocation import revoked_tokens
+from app.core.report_jobs import report_worker
+from app.core.report_cache import purge_unreferenced_artifacts
+from app.core.export_tickets import purge_expired_export_tickets
+from app.core.config import settings
+from app.db.session import SessionLocal
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +45,51 @@ class BackupScheduler:
                 replace_existing=True
             )
             
+            # Correct drift in denormalized project statistics every night
+            self.scheduler.add_job(
+                func=self._reconcile_project_stats,
+                trigger=CronTrigger(hour=3, minute=0),
+                id='project_stats_reconciliation',
+                name='Project Statistics Reconciliation',
+                replace_existing=True
+            )
+            
+            # Mirror revoked tokens in memory, starting right away
+            self.scheduler.add_job(
+                func=self._refresh_revoked_tokens,
+                trigger=IntervalTrigger(seconds=settings.TOKEN_REVOCATION_REFRESH_SECONDS),
+                id='revoked_tokens_refresh',
+                name='Revoked Tokens Refresh',
+                next_run_time=datetime.now(),
+                max_instances=1,
+                coalesce=True,
+                replace_existing=True
+            )
+            
+            self.scheduler.add_job(
+                func=self._purge_revoked_tokens,
+                trigger=IntervalTrigger(hours=1),
+                id='revoked_tokens_purge',
+                name='Expired Revoked Tokens Purge',
+                replace_existing=True
+            )
+            
+            self.scheduler.add_job(
+                func=self._purge_report_artifacts,
+                trigger=IntervalTrigger(hours=1),
+                id='report_artifacts_purge',
+                name='Unreferenced Report Files Purge',
+                replace_existing=True
+            )
+            
+            self.scheduler.add_job(
+                func=self._purge_export_tickets,
+                trigger=IntervalTrigger(hours=1),
+                id='export_tickets_purge',
+                name='Expired Export Tickets Purge',
+                replace_existing=True
+            )
+            
             # Start the scheduler
             self.scheduler.start()
             logger.info("Backup scheduler started - backups will run every 24 hours")
@@ -64,6 +122,67 @@ class BackupScheduler:
                 
         except Exception as e:
             logger.error(f"Error during scheduled backup: {str(e)}")
+    
+    def _reconcile_project_stats(self):
+        """Recompute denormalized project statistics."""
+        db = SessionLocal()
+        try:
+            corrected = reconcile_project_stats(db)
+            logger.info(f"Project statistics reconciled, {corrected} project(s) corrected")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error during project statistics reconciliation: {str(e)}")
+        finally:
+            db.close()
+    
+    def _refresh_revoked_tokens(self):
+        """Pick up tokens revoked by other workers."""
+        db = SessionLocal()
+        try:
+            revoked_tokens.refresh(db)
+        except Exception as e:
+            logger.error(f"Error refreshing revoked tokens: {str(e)}")
+        finally:
+            db.close()
+    
+    def _purge_revoked_tokens(self):
+        """Delete revocations of expired tokens."""
+        db = SessionLocal()
+        try:
+            deleted = revoked_tokens.purge_expired(db)
+            if deleted:
+                logger.info(f"Purged {deleted} expired revoked token(s)")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error purging revoked tokens: {str(e)}")
+        finally:
+            db.close()
+    
+    def _purge_report_artifacts(self):
+        """Delete cached report files no report refers to."""
+        db = SessionLocal()
+        try:
+            purged = purge_unreferenced_artifacts(db)
+            if purged:
+                logger.info(f"Purged {purged} unreferenced report file(s)")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error purging report files: {str(e)}")
+        finally:
+            db.close()
+    
+    def _purge_export_tickets(self):
+        """Delete report export tickets that were never used."""
+        db = SessionLocal()
+        try:
+            purged = purge_expired_export_tickets(db)
+            if purged:
+                logger.info(f"Purged {purged} expired export ticket(s)")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error purging export tickets: {str(e)}")
+        finally:
+            db.close()
 
 
 # Global scheduler instance
@@ -79,9 +198,20 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     # Startup
     logger.info("Application startup - initializing services")
     scheduler.start()
+    # Keep dashboard and user caches of all workers in sync with writes made elsewhere;
+    # change logs also cover attachments, which have no trigger of their own
+    activity_stream.add_change_listener(dashboard_cache.invalidate_project)
+    activity_stream.add_channel_listener(DASHBOARD_CHANNEL, dashboard_cache.on_notify)
+    activity_stream.add_channel_listener(USER_CHANNEL, user_cache.on_notify)
+    activity_stream.start()
+    if settings.REPORT_WORKER_IN_PROCESS:
+        report_worker.start()
     
     yield
     
     # Shutdown
     logger.info("Application shutdown - cleaning up services")
+    report_worker.stop()
+    await activity_stream.stop()
+    password_hasher.shutdown()
     scheduler.shutdown()
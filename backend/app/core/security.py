@@ -1,10 +1,17 @@
 """Security utilities for JWT tokens and password hashing."""
 
+import asyncio
+import hashlib
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from jose import JWTError, jwt
 import bcrypt
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 
@@ -18,11 +25,84 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """Hash a password."""
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check if a hash was made with a different bcrypt cost than configured."""
+    try:
+        rounds = int(hashed_password.split('$')[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != settings.BCRYPT_ROUNDS
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many password hashing jobs are already waiting."""
+
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated process pool.
+    
+    Hashing is CPU bound, so it is kept off the request threadpool and out
+    of the GIL. Jobs beyond ``max_pending`` are rejected instead of queued
+    so a burst of logins cannot build an unbounded backlog.
+    """
+    
+    def __init__(self, workers: int, max_pending: int):
+        """Initialize the hasher.
+        
+        Args:
+            workers: Number of hashing processes
+            max_pending: Maximum number of running plus queued jobs
+        """
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+    
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash."""
+        return await self._run(verify_password, plain_password, hashed_password)
+    
+    async def hash(self, password: str) -> str:
+        """Hash a password."""
+        return await self._run(get_password_hash, password)
+    
+    async def _run(self, func, *args):
+        """Run a hashing function in the pool, rejecting it if the pool is saturated."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PasswordHasherBusy()
+            self._pending += 1
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            executor = self._executor
+        
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+    
+    def shutdown(self):
+        """Stop the hashing processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+# Global password hasher instance
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token."""
     to_encode = data.copy()
@@ -32,15 +112,52 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    # The token id lets a single token be revoked server-side
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
+# Payloads of verified tokens, keyed by token digest and kept until the token expires
+_verified_tokens = TTLCache(maxsize=settings.TOKEN_CACHE_MAXSIZE)
+_verified_tokens_key: Optional[bytes] = None
+_verified_tokens_lock = threading.Lock()
+
+
+def _signing_key_fingerprint() -> bytes:
+    """Fingerprint of the key material tokens are verified with."""
+    return hashlib.sha256(f"{settings.ALGORITHM}:{settings.SECRET_KEY}".encode('utf-8')).digest()
+
+
 def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
-    """Decode and verify JWT token."""
+    """Decode and verify JWT token.
+    
+    Verified payloads are cached until the token's ``exp``, so repeated
+    requests with the same token skip signature verification. The cache is
+    dropped whenever the signing key changes.
+    """
+    global _verified_tokens_key
+    
+    fingerprint = _signing_key_fingerprint()
+    if fingerprint != _verified_tokens_key:
+        with _verified_tokens_lock:
+            if fingerprint != _verified_tokens_key:
+                _verified_tokens.clear()
+                _verified_tokens_key = fingerprint
+    
+    digest = hashlib.sha256(token.encode('utf-8')).digest()
+    payload = _verified_tokens.get(digest)
+    if payload is not None:
+        if payload["exp"] > time.time():
+            return dict(payload)
+        _verified_tokens.invalidate(digest)
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         return None
+    
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)) and exp > time.time():
+        _verified_tokens.set(digest, dict(payload), ttl=exp - time.time())
+    return payload
@@ -0,0 +1,95 @@
+"""Server-side revocation of access tokens by their ``jti`` claim."""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.revoked_token import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+# Revocations committed late by slow transactions are still picked up within this window
+REFRESH_LOOKBACK = timedelta(minutes=1)
+
+
+class TokenRevocationStore:
+    """In-memory mirror of the revoked_tokens table.
+
+    Requests only pay a set lookup. Each worker refreshes the mirror
+    incrementally from the table, and revocations made by this worker are
+    visible to it immediately. Entries are dropped once their token expires.
+    """
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._expires: Dict[str, float] = {}
+        self._watermark: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """Check if a token id was revoked."""
+        return jti is not None and jti in self._expires
+
+    def revoke(self, db: Session, jti: str, user_id: int, exp: float):
+        """Revoke a token until its expiry time (a UNIX timestamp)."""
+        # Concurrent logouts with the same token must not fail on the primary key
+        db.execute(
+            insert(RevokedToken).values(
+                jti=jti,
+                user_id=user_id,
+                expires_at=datetime.fromtimestamp(exp, tz=timezone.utc)
+            ).on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+        )
+        db.commit()
+
+        with self._lock:
+            self._expires[jti] = exp
+
+    def refresh(self, db: Session):
+        """Load revocations added since the last refresh and forget expired ones."""
+        query = db.query(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at).filter(
+            RevokedToken.expires_at > datetime.now(timezone.utc)
+        )
+        if self._watermark is not None:
+            query = query.filter(RevokedToken.revoked_at >= self._watermark - REFRESH_LOOKBACK)
+        rows = query.all()
+
+        now = time.time()
+        with self._lock:
+            for jti, expires_at, revoked_at in rows:
+                self._expires[jti] = expires_at.timestamp()
+                if self._watermark is None or revoked_at > self._watermark:
+                    self._watermark = revoked_at
+
+            expired = [jti for jti, exp in self._expires.items() if exp <= now]
+            for jti in expired:
+                del self._expires[jti]
+
+            # An empty table still needs a starting point for incremental refreshes
+            if self._watermark is None:
+                self._watermark = datetime.now(timezone.utc)
+
+    def purge_expired(self, db: Session) -> int:
+        """Delete revocations of tokens that have expired anyway.
+
+        Returns:
+            Number of deleted rows
+        """
+        deleted = db.query(RevokedToken).filter(
+            RevokedToken.expires_at <= datetime.now(timezone.utc)
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    def __len__(self) -> int:
+        """Number of revoked tokens currently tracked."""
+        return len(self._expires)
+
+
+# Global token revocation store instance
+revoked_tokens = TokenRevocationStore()
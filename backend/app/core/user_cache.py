@@ -0,0 +1,114 @@
+"""Cache of authenticated users, invalidated by writes to users."""
+
+import logging
+import threading
+from typing import Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.user import User
+from app.models.role import UserRole
+
+logger = logging.getLogger(__name__)
+
+# Channel notified by the users update/delete trigger
+USER_CHANNEL = "users"
+
+_USER_COLUMNS = [attr.key for attr in inspect(User).column_attrs]
+
+
+class UserCache:
+    """Per-process cache of user rows for request authentication.
+
+    Entries are dropped when a user is written by this process or, through
+    the ``users`` notification channel, by any other worker. A generation
+    counter keeps a row read before an invalidation from being stored after it.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of cached users
+            ttl: Lifetime in seconds, bounding staleness if a notification is lost
+        """
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_user(self, user_id: int, db: Session) -> Optional[User]:
+        """Get a user attached to ``db``, querying only on a cache miss."""
+        values = self._cache.get(user_id)
+        if values is not None:
+            user = User(**values)
+            make_transient_to_detached(user)
+            return db.merge(user, load=False)
+
+        with self._lock:
+            generation = self._generation
+
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            return None
+
+        values = {key: getattr(user, key) for key in _USER_COLUMNS}
+        with self._lock:
+            if self._generation == generation:
+                self._cache.set(user_id, values)
+        return user
+
+    def invalidate(self, user_id: Optional[int]):
+        """Drop a user, or every user if ``user_id`` is None."""
+        with self._lock:
+            self._generation += 1
+            if user_id is None:
+                self._cache.clear()
+            else:
+                self._cache.invalidate(user_id)
+
+    def on_notify(self, payload: Optional[str]):
+        """Handle a ``users`` channel notification carrying the user id."""
+        if payload is None:
+            self.invalidate(None)
+            return
+        try:
+            self.invalidate(int(payload))
+        except ValueError:
+            logger.error(f"Invalid user notification payload: {payload}")
+
+
+# Global user cache instance
+user_cache = UserCache(maxsize=settings.USER_CACHE_MAXSIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_written_users(session: Session, flush_context):
+    """Remember which users the flush updated, deleted or changed the roles of."""
+    written = session.info.setdefault("user_cache_written", set())
+    for instance in list(session.dirty) + list(session.deleted):
+        if isinstance(instance, User) and instance.id is not None:
+            written.add(instance.id)
+    # Role changes bump the user's permissions version in the database
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(instance, UserRole) and instance.user_id is not None:
+            written.add(instance.user_id)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _invalidate_written_users(session: Session):
+    """Invalidate users written by a committed transaction right away.
+
+    Other workers learn about the change from the trigger notification.
+    """
+    for user_id in session.info.pop("user_cache_written", ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _forget_written_users(session: Session):
+    """Nothing was written, nothing needs invalidating."""
+    session.info.pop("user_cache_written", None)
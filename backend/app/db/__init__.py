@@ -11,5 +11,6 @@ from app.models.comment import Comment
 from app.models.file_attachment import FileAttachment
 from app.models.change_log import ChangeLog
 from app.models.notification import Notification
+from app.models.revoked_token import RevokedToken
 
 __all__ = ["get_db", "SessionLocal", "engine", "Base"]
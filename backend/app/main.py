@@ -2,10 +2,10 @@
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 
 from app.core.config import settings
+from app.core.compression import EventStreamAwareGZipMiddleware
 from app.core.scheduler import lifespan
 from app.api.v1.router import api_router
 
@@ -27,7 +27,7 @@ app.add_middleware(
 )
 
 
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+app.add_middleware(EventStreamAwareGZipMiddleware, minimum_size=1000)
 
 app.include_router(api_router, prefix="/api")
 
@@ -14,7 +14,8 @@ from app.models.comment import Comment
 from app.models.file_attachment import FileAttachment
 from app.models.change_log import ChangeLog
 from app.models.notification import Notification
-from app.models.report import Report
+from app.models.report import Report, ReportArtifact, ReportJob, ReportExportTicket
+from app.models.revoked_token import RevokedToken
 
 __all__ = [
     "User",
@@ -30,4 +31,8 @@ __all__ = [
     "ChangeLog",
     "Notification",
     "Report",
+    "ReportArtifact",
+    "ReportJob",
+    "ReportExportTicket",
+    "RevokedToken",
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, CheckConstraint, func
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, CheckConstraint, Index, FetchedValue, func
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -9,18 +9,29 @@ class ChangeLog(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     defect_id = Column(Integer, ForeignKey("defects.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Denormalized from the defect so project feeds don't need to join defects
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     field_name = Column(String(100), nullable=False)
     old_value = Column(Text)
     new_value = Column(Text)
     change_type = Column(String(20), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    # Numbered per project by an insert trigger, in commit order; live feeds resume from it
+    project_seq = Column(Integer, FetchedValue(), nullable=False)
     
     __table_args__ = (
         CheckConstraint(
             "change_type IN ('create', 'update', 'delete', 'status_change', 'comment')",
             name="change_type_check"
         ),
+        # Keyset pagination over project history, optionally narrowed by user or change type
+        Index("ix_change_logs_project_id_created_at", project_id, created_at.desc(), id.desc()),
+        Index("ix_change_logs_project_id_user_id_created_at", project_id, user_id, created_at.desc(), id.desc()),
+        Index("ix_change_logs_project_id_change_type_created_at", project_id, change_type, created_at.desc(), id.desc()),
+        # Engineers' history pages only cover their assigned defects
+        Index("ix_change_logs_defect_id_created_at", defect_id, created_at.desc(), id.desc()),
+        Index("ix_change_logs_project_id_project_seq", project_id, project_seq, unique=True),
     )
     
     defect = relationship("Defect", back_populates="change_logs")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, func
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index, func
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -9,11 +9,17 @@ class Comment(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     defect_id = Column(Integer, ForeignKey("defects.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Copied from the defect on insert
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     content = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
+    __table_args__ = (
+        Index("ix_comments_project_id_created_at", project_id, created_at.desc()),
+    )
+    
     defect = relationship("Defect", back_populates="comments")
     author = relationship("User", back_populates="comments")
     
@@ -1,6 +1,6 @@
 """Defect models."""
 
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Boolean, Numeric, CheckConstraint, func
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Boolean, Numeric, CheckConstraint, Index, func
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -105,6 +105,7 @@ class Defect(Base):
             "actual_hours IS NULL OR actual_hours > 0",
             name="defects_actual_hours_check"
         ),
+        Index("ix_defects_project_id_assignee_id_status_id", project_id, assignee_id, status_id),
     )
     
     project = relationship("Project", back_populates="defects")
@@ -27,6 +27,15 @@ class Project(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     is_active = Column(Boolean, default=True, index=True)
     
+    # Maintained on defect and membership writes, reconciled nightly
+    defects_count = Column(Integer, nullable=False, default=0, server_default="0")
+    team_size = Column(Integer, nullable=False, default=0, server_default="0")
+    last_defect_date = Column(DateTime(timezone=True))
+    # Bumped by database triggers whenever anything printed in the project's reports changes
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # Last project_seq handed out to the project's change logs
+    change_log_seq = Column(Integer, nullable=False, default=0, server_default="0")
+    
     __table_args__ = (
         CheckConstraint(
             "status IN ('planning', 'active', 'completed', 'cancelled')",
@@ -1,6 +1,6 @@
 """Report model."""
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, func, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, CheckConstraint, Index, JSON, func, text, Text
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import relationship
 
@@ -20,10 +20,83 @@ class Report(Base):
     format = Column(String(20), nullable=False)
     file_path = Column(String(500), nullable=False)
     file_size = Column(Integer)
+    # Cached file shared by reports with the same content, counted by a trigger
+    artifact_id = Column(Integer, ForeignKey("report_artifacts.id"), index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     
+    __table_args__ = (
+        # Access filtering matches project_ids with array containment
+        Index("ix_reports_project_ids", project_ids, postgresql_using="gin"),
+    )
+    
     project = relationship("Project", back_populates="reports")
     creator = relationship("User", back_populates="reports")
+    artifact = relationship("ReportArtifact")
     
     def __repr__(self):
         return f"<Report {self.id}: {self.title}>"
+
+
+class ReportArtifact(Base):
+    """Generated report file, addressed by a hash of what it was built from."""
+    __tablename__ = "report_artifacts"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String(64), nullable=False, unique=True)
+    format = Column(String(20), nullable=False)
+    file_path = Column(String(500), nullable=False)
+    file_size = Column(Integer)
+    # Number of reports using the file, unreferenced files are purged
+    ref_count = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<ReportArtifact {self.id}: {self.cache_key}>"
+
+
+class ReportJob(Base):
+    """Queued report generation, processed by the report worker."""
+    __tablename__ = "report_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    created_by = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    # ReportCreate fields, with project_ids always set
+    params = Column(JSON, nullable=False)
+    status = Column(String(20), nullable=False, default="queued", server_default="queued")
+    progress = Column(Integer, nullable=False, default=0, server_default="0")
+    report_id = Column(Integer, ForeignKey("reports.id", ondelete="SET NULL"))
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    # Renewed by the worker while the job runs, see report_jobs.JOB_LEASE_SECONDS
+    heartbeat_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('queued', 'running', 'completed', 'failed')",
+            name="report_job_status_check"
+        ),
+        # Workers claim the oldest queued job
+        Index("ix_report_jobs_queued", id, postgresql_where=text("status = 'queued'")),
+    )
+    
+    report = relationship("Report")
+    
+    def __repr__(self):
+        return f"<ReportJob {self.id}: {self.status}>"
+
+
+class ReportExportTicket(Base):
+    """Single-use permission to download one ad-hoc report export."""
+    __tablename__ = "report_export_tickets"
+    
+    # SHA-256 of the ticket handed to the client
+    token_hash = Column(String(64), primary_key=True)
+    created_by = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # ReportCreate fields
+    params = Column(JSON, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<ReportExportTicket {self.token_hash[:8]}>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, func
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index, func, text
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -17,6 +17,20 @@ class User(Base):
     is_superuser = Column(Boolean, default=False, index=True)
     date_joined = Column(DateTime(timezone=True), server_default=func.now())
     last_login = Column(DateTime(timezone=True))
+    # Bumped by a user_roles trigger whenever the user's roles change
+    permissions_version = Column(Integer, nullable=False, default=0, server_default="0")
+    
+    __table_args__ = (
+        # Directory search: trigram indexes for substring matches, pattern indexes for short prefixes
+        Index("ix_users_username_trgm", username, postgresql_using="gin", postgresql_ops={"username": "gin_trgm_ops"}),
+        Index("ix_users_first_name_trgm", first_name, postgresql_using="gin", postgresql_ops={"first_name": "gin_trgm_ops"}),
+        Index("ix_users_last_name_trgm", last_name, postgresql_using="gin", postgresql_ops={"last_name": "gin_trgm_ops"}),
+        Index("ix_users_email_trgm", email, postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+        Index("ix_users_username_lower_prefix", text("lower(username) text_pattern_ops")),
+        Index("ix_users_first_name_lower_prefix", text("lower(first_name) text_pattern_ops")),
+        Index("ix_users_last_name_lower_prefix", text("lower(last_name) text_pattern_ops")),
+        Index("ix_users_email_lower_prefix", text("lower(email) text_pattern_ops")),
+    )
     
     user_roles = relationship("UserRole", foreign_keys="UserRole.user_id", back_populates="user", cascade="all, delete-orphan")
     granted_roles = relationship("UserRole", foreign_keys="UserRole.granted_by")
@@ -49,7 +49,28 @@ class ReportResponse(BaseModel):
     created_at: datetime
 
 
+class ReportJobResponse(BaseModel):
+    """Report job response schema."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    status: str
+    progress: int
+    report_id: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class ReportExportTicketResponse(BaseModel):
+    """Ticket for downloading an ad-hoc export, see ``GET /reports/export/{ticket}``."""
+    ticket: str
+    expires_in: int
+
+
 class ReportList(BaseModel):
     """Report list schema."""
     reports: list[ReportResponse]
+    # Reports in this page; more pages are announced by the X-Next-Cursor header
     total: int
@@ -0,0 +1,21 @@
+"""Standalone report worker.
+
+Run with ``python -m app.worker``.
+"""
+
+import logging
+import signal
+
+from app.core.report_jobs import report_worker
+
+
+def main():
+    """Process report jobs until SIGTERM or SIGINT."""
+    logging.basicConfig(level=logging.INFO)
+    signal.signal(signal.SIGTERM, lambda *_: report_worker.stop())
+    signal.signal(signal.SIGINT, lambda *_: report_worker.stop())
+    report_worker.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark login throughput under concurrency.
+
+Fires concurrent logins at a running API while probing /health, to show
+that password hashing neither stalls nor starves other requests.
+
+Usage:
+    python benchmarks/login_throughput.py --username admin --password admin123 \\
+        --requests 200 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def _percentile(values, fraction):
+    """Get a percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def _login_worker(client, queue, args, latencies, statuses):
+    """Log in until the queue of requests is drained."""
+    while True:
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        started = time.perf_counter()
+        response = await client.post(
+            "/api/auth/login",
+            json={"username": args.username, "password": args.password}
+        )
+        latencies.append(time.perf_counter() - started)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+
+async def _probe_health(client, stop, latencies):
+    """Measure latency of a cheap endpoint while logins are running."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/health")
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0.05)
+
+
+async def main(args):
+    """Run the benchmark and print a summary."""
+    queue = asyncio.Queue()
+    for _ in range(args.requests):
+        queue.put_nowait(None)
+
+    login_latencies, health_latencies, statuses = [], [], {}
+    stop = asyncio.Event()
+    limits = httpx.Limits(max_connections=args.concurrency + 1)
+
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60) as client:
+        probe = asyncio.create_task(_probe_health(client, stop, health_latencies))
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            _login_worker(client, queue, args, login_latencies, statuses)
+            for _ in range(args.concurrency)
+        ])
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe
+
+    print(f"Logins:      {args.requests} at concurrency {args.concurrency} in {elapsed:.2f}s")
+    print(f"Throughput:  {statuses.get(200, 0) / elapsed:.1f} successful logins/s")
+    print(f"Statuses:    {dict(sorted(statuses.items()))}")
+    print(
+        f"Login ms:    p50 {statistics.median(login_latencies) * 1000:.0f}"
+        f"  p95 {_percentile(login_latencies, 0.95) * 1000:.0f}"
+    )
+    if health_latencies:
+        print(
+            f"/health ms:  p50 {statistics.median(health_latencies) * 1000:.1f}"
+            f"  p95 {_percentile(health_latencies, 0.95) * 1000:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark login throughput under concurrency")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
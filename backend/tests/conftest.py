@@ -0,0 +1,75 @@
+"""Shared fixtures for database tests.
+
+Tests run against the PostgreSQL database named by ``TEST_DATABASE_URL``
+and are skipped when it is not set. The schema is created inside a
+transaction that is rolled back after each test, so the database is left
+untouched.
+"""
+
+import os
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401 - registers every model on Base.metadata
+from app.db.base import Base
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """Engine of the test database."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_engine(TEST_DATABASE_URL)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    """Session on a fresh schema that is rolled back after the test."""
+    connection = engine.connect()
+    transaction = connection.begin()
+    # The users search indexes need trigram operators
+    connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    Base.metadata.create_all(connection)
+
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+class QueryCounter:
+    """Number of statements sent to the database."""
+
+    def __init__(self):
+        """Initialize the counter."""
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        """Count a statement, as a ``before_cursor_execute`` listener."""
+        self.count += 1
+
+
+@pytest.fixture
+def count_queries(db):
+    """Context manager counting the statements a block sends through ``db``."""
+    @contextmanager
+    def counting():
+        counter = QueryCounter()
+        connection = db.connection()
+        event.listen(connection, "before_cursor_execute", counter)
+        try:
+            yield counter
+        finally:
+            event.remove(connection, "before_cursor_execute", counter)
+
+    return counting
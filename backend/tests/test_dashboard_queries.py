@@ -0,0 +1,86 @@
+"""Query budget of the dashboard activity feed."""
+
+from app.api.v1.endpoints.dashboard import _resolve_action_names
+from app.models.change_log import ChangeLog
+from app.models.defect import DefectStatus, Priority
+from app.models.user import User
+
+
+def _seed_references(db, size):
+    """Add ``size`` statuses, priorities and users for change logs to refer to."""
+    statuses = [
+        DefectStatus(name=f"status_{i}", display_name=f"Status {i}", order_index=i)
+        for i in range(size)
+    ]
+    priorities = [
+        Priority(name=f"priority_{i}", display_name=f"Priority {i}", urgency_level=i)
+        for i in range(size)
+    ]
+    users = [
+        User(
+            username=f"user_{i}",
+            email=f"user_{i}@example.com",
+            password_hash="not-a-hash",
+            first_name=f"First{i}",
+            last_name=f"Last{i}"
+        )
+        for i in range(size)
+    ]
+    db.add_all(statuses + priorities + users)
+    db.flush()
+    return statuses, priorities, users
+
+
+def _action_logs(statuses, priorities, users, count):
+    """Build ``count`` logs of each referencing change type, pointing at different rows."""
+    logs = []
+    for i in range(count):
+        logs.append(ChangeLog(
+            change_type='status_change', field_name='status_id',
+            old_value=str(statuses[i].id), new_value=str(statuses[i + 1].id)
+        ))
+        logs.append(ChangeLog(
+            change_type='update', field_name='priority_id',
+            old_value=str(priorities[i].id), new_value=str(priorities[i + 1].id)
+        ))
+        logs.append(ChangeLog(
+            change_type='update', field_name='assignee_id',
+            old_value=None, new_value=str(users[i].id)
+        ))
+    return logs
+
+
+def test_resolve_action_names_query_count_does_not_grow(db, count_queries):
+    statuses, priorities, users = _seed_references(db, 51)
+
+    with count_queries() as few:
+        _resolve_action_names(_action_logs(statuses, priorities, users, 1), db)
+    with count_queries() as many:
+        _resolve_action_names(_action_logs(statuses, priorities, users, 50), db)
+
+    # One query each for statuses, priorities and users
+    assert few.count == 3
+    assert many.count == few.count
+
+
+def test_resolve_action_names_resolves_every_reference(db):
+    statuses, priorities, users = _seed_references(db, 3)
+
+    names = _resolve_action_names(_action_logs(statuses, priorities, users, 2), db)
+
+    assert names["statuses"] == {status.id: status.display_name for status in statuses}
+    assert names["priorities"] == {priority.id: priority.display_name for priority in priorities}
+    assert names["users"] == {user.id: f"{user.first_name} {user.last_name}" for user in users[:2]}
+
+
+def test_resolve_action_names_skips_queries_without_references(db, count_queries):
+    logs = [
+        ChangeLog(change_type='create', field_name='defect'),
+        ChangeLog(change_type='update', field_name='title', old_value='Old', new_value='New')
+    ]
+
+    with count_queries() as counter:
+        names = _resolve_action_names(logs, db)
+
+    assert counter.count == 0
+    assert names == {"statuses": {}, "priorities": {}, "users": {}}
@@ -0,0 +1,53 @@
+"""Query budget of the project listing shown on the dashboard."""
+
+import pytest
+
+from app.api.v1.endpoints.projects import get_projects
+from app.models.project import Project
+from app.models.role import Role, UserRole
+from app.models.user import User
+
+
+def _seed_projects(db, size, is_superuser=False):
+    """Add a user who is a member of ``size`` projects, and return the user's id."""
+    role = Role(name="engineer", display_name="Engineer", permissions={"create_defects": True})
+    user = User(
+        username="member",
+        email="member@example.com",
+        password_hash="not-a-hash",
+        is_superuser=is_superuser
+    )
+    projects = [Project(name=f"Project {i}") for i in range(size)]
+    db.add_all([role, user] + projects)
+    db.flush()
+
+    db.add_all([UserRole(user_id=user.id, role_id=role.id, project_id=project.id) for project in projects])
+    db.flush()
+
+    # Listing must load everything it returns itself, not reuse objects from seeding
+    user_id = user.id
+    db.expunge_all()
+    return user_id
+
+
+def _count_listing_queries(db, count_queries, user_id):
+    """Count the queries of listing the user's projects."""
+    current_user = db.get(User, user_id)
+    with count_queries() as counter:
+        projects = get_projects(skip=0, limit=100, current_user=current_user, db=db)
+    return counter.count, projects
+
+
+@pytest.mark.parametrize("is_superuser", [False, True])
+def test_project_listing_query_count_does_not_grow(db, count_queries, is_superuser):
+    few_user_id = _seed_projects(db, 1, is_superuser)
+    few_count, few_projects = _count_listing_queries(db, count_queries, few_user_id)
+    db.rollback()
+
+    many_user_id = _seed_projects(db, 50, is_superuser)
+    many_count, many_projects = _count_listing_queries(db, count_queries, many_user_id)
+
+    assert len(few_projects) == 1
+    assert len(many_projects) == 50
+    assert few_count == 1
+    assert many_count == few_count
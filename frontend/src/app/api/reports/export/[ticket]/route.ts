@@ -0,0 +1,32 @@
+import { NextResponse } from 'next/server';
+import { getBackendUrl } from '@/utils/config';
+
+export async function GET(
+  request: Request,
+  { params }: { params: { ticket: string } }
+) {
+  try {
+    const response = await fetch(getBackendUrl(`reports/export/${encodeURIComponent(params.ticket)}`), {
+      cache: 'no-store',
+    });
+
+    if (!response.ok) {
+      const error = await response.json().catch(() => ({ error: 'Backend error' }));
+      return NextResponse.json(error, { status: response.status });
+    }
+
+    // Pass the body through as it arrives instead of buffering the report
+    return new NextResponse(response.body, {
+      headers: {
+        'Content-Type': response.headers.get('content-type') || 'application/octet-stream',
+        'Content-Disposition': response.headers.get('content-disposition') || 'attachment; filename="report"',
+      },
+    });
+  } catch (error) {
+    console.error('Backend connection error:', error);
+    return NextResponse.json(
+      { error: 'Failed to connect to backend' },
+      { status: 503 }
+    );
+  }
+}
@@ -0,0 +1,27 @@
+import { NextResponse } from 'next/server';
+import { getBackendUrl } from '@/utils/config';
+
+export async function POST(request: Request) {
+  try {
+    const authHeader = request.headers.get('authorization');
+    const body = await request.json();
+
+    const response = await fetch(getBackendUrl('reports/export'), {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        ...(authHeader && { 'Authorization': authHeader }),
+      },
+      body: JSON.stringify(body),
+    });
+
+    const data = await response.json().catch(() => ({ error: 'Backend error' }));
+    return NextResponse.json(data, { status: response.status });
+  } catch (error) {
+    console.error('Backend connection error:', error);
+    return NextResponse.json(
+      { error: 'Failed to connect to backend' },
+      { status: 503 }
+    );
+  }
+}
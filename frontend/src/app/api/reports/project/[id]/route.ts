@@ -0,0 +1,42 @@
+import { NextResponse } from 'next/server';
+import { getBackendUrl } from '@/utils/config';
+
+export async function GET(
+  request: Request,
+  { params }: { params: { id: string } }
+) {
+  try {
+    const authHeader = request.headers.get('authorization');
+    const { searchParams } = new URL(request.url);
+    const cursor = searchParams.get('cursor');
+
+    const response = await fetch(
+      getBackendUrl(`reports/project/${params.id}${cursor ? `?cursor=${encodeURIComponent(cursor)}` : ''}`),
+      {
+        method: 'GET',
+        headers: {
+          'Content-Type': 'application/json',
+          ...(authHeader && { 'Authorization': authHeader }),
+        },
+        cache: 'no-store',
+      }
+    );
+
+    if (!response.ok) {
+      const error = await response.json().catch(() => ({ error: 'Backend error' }));
+      return NextResponse.json(error, { status: response.status });
+    }
+
+    const data = await response.json();
+    const nextCursor = response.headers.get('x-next-cursor');
+    return NextResponse.json(data, {
+      headers: nextCursor ? { 'X-Next-Cursor': nextCursor } : undefined,
+    });
+  } catch (error) {
+    console.error('Backend connection error:', error);
+    return NextResponse.json(
+      { error: 'Failed to connect to backend' },
+      { status: 503 }
+    );
+  }
+}
@@ -21,7 +21,7 @@ export async function POST(request: Request) {
     }
 
     const data = await response.json();
-    return NextResponse.json(data, { status: 201 });
+    return NextResponse.json(data, { status: response.status });
   } catch (error) {
     console.error('Backend connection error:', error);
     return NextResponse.json(
@@ -36,6 +36,7 @@ export async function GET(request: Request) {
     const authHeader = request.headers.get('authorization');
     const { searchParams } = new URL(request.url);
     const projectId = searchParams.get('projectId');
+    const cursor = searchParams.get('cursor');
 
     if (!projectId) {
       return NextResponse.json(
@@ -45,7 +46,7 @@ export async function GET(request: Request) {
     }
 
     const response = await fetch(
-      getBackendUrl(`reports/project/${projectId}`),
+      getBackendUrl(`reports/project/${projectId}${cursor ? `?cursor=${encodeURIComponent(cursor)}` : ''}`),
       {
         method: 'GET',
         headers: {
@@ -62,7 +63,10 @@ export async function GET(request: Request) {
     }
 
     const data = await response.json();
-    return NextResponse.json(data);
+    const nextCursor = response.headers.get('x-next-cursor');
+    return NextResponse.json(data, {
+      headers: nextCursor ? { 'X-Next-Cursor': nextCursor } : undefined,
+    });
   } catch (error) {
     console.error('Backend connection error:', error);
     return NextResponse.json(
@@ -24,7 +24,10 @@ export async function GET(request: Request) {
     }
 
     const data = await response.json();
-    return NextResponse.json(data);
+    const nextCursor = response.headers.get('x-next-cursor');
+    return NextResponse.json(data, {
+      headers: nextCursor ? { 'X-Next-Cursor': nextCursor } : undefined,
+    });
   } catch (error) {
     console.error('Backend connection error:', error);
     return NextResponse.json(
@@ -28,17 +28,23 @@ export default function ReportsPage() {
   const projectId = params.id as string;
 
   const [reports, setReports] = useState<Report[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [selectedReport, setSelectedReport] = useState<Report | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [projectName, setProjectName] = useState<string>("");
   const [userRole, setUserRole] = useState<string | undefined>(undefined);
 
-  const fetchReports = async () => {
+  const fetchReports = async (cursor?: string) => {
     try {
-      setLoading(true);
+      if (cursor) {
+        setLoadingMore(true);
+      } else {
+        setLoading(true);
+      }
       const token = localStorage.getItem('token');
-      const response = await fetch(`/api/reports/project/${projectId}`, {
+      const response = await fetch(`/api/reports/project/${projectId}${cursor ? `?cursor=${encodeURIComponent(cursor)}` : ''}`, {
         headers: {
           'Authorization': `Bearer ${token}`,
           'Content-Type': 'application/json',
@@ -47,7 +53,9 @@ export default function ReportsPage() {
 
       if (response.ok) {
         const data = await response.json();
-        setReports(data.reports || []);
+        const page: Report[] = data.reports || [];
+        setReports((previous) => (cursor ? [...previous, ...page] : page));
+        setNextCursor(response.headers.get('x-next-cursor'));
       } else {
         const errorData = await response.json();
         setError(errorData.detail || 'Не удалось загрузить отчеты');
@@ -57,6 +65,7 @@ export default function ReportsPage() {
       setError('Не удалось загрузить отчеты');
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
@@ -196,7 +205,7 @@ export default function ReportsPage() {
           <div className="grid grid-cols-1 lg:grid-cols-3 gap-6">
             <div className="lg:col-span-1 space-y-4">
               <h2 className="text-[18px] font-semibold text-[#212529] mb-4">
-                Список отчетов ({reports.length})
+                Список отчетов ({reports.length}{nextCursor ? '+' : ''})
               </h2>
               {reports.map((report) => (
                 <Card
@@ -224,6 +233,16 @@ export default function ReportsPage() {
                   </CardContent>
                 </Card>
               ))}
+              {nextCursor && (
+                <Button
+                  variant="outline"
+                  className="w-full"
+                  onClick={() => fetchReports(nextCursor)}
+                  disabled={loadingMore}
+                >
+                  {loadingMore ? 'Загрузка...' : 'Показать еще'}
+                </Button>
+              )}
             </div>
 
             <div className="lg:col-span-2">
@@ -26,6 +26,8 @@ interface Report {
 export default function AllReportsPage() {
   const router = useRouter();
   const [reports, setReports] = useState<Report[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [selectedReport, setSelectedReport] = useState<Report | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
@@ -65,11 +67,15 @@ export default function AllReportsPage() {
     }
   };
 
-  const fetchReports = async () => {
+  const fetchReports = async (cursor?: string) => {
     try {
-      setLoading(true);
+      if (cursor) {
+        setLoadingMore(true);
+      } else {
+        setLoading(true);
+      }
       const token = localStorage.getItem('token');
-      const response = await fetch('/api/reports/project/0', {
+      const response = await fetch(`/api/reports/project/0${cursor ? `?cursor=${encodeURIComponent(cursor)}` : ''}`, {
         headers: {
           'Authorization': `Bearer ${token}`,
           'Content-Type': 'application/json',
@@ -78,7 +84,9 @@ export default function AllReportsPage() {
 
       if (response.ok) {
         const data = await response.json();
-        setReports(data.reports || []);
+        const page: Report[] = data.reports || [];
+        setReports((previous) => (cursor ? [...previous, ...page] : page));
+        setNextCursor(response.headers.get('x-next-cursor'));
         setError(null);
       } else {
         const errorData = await response.json();
@@ -88,6 +96,7 @@ export default function AllReportsPage() {
       console.error('Error fetching reports:', error);
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
@@ -209,7 +218,7 @@ export default function AllReportsPage() {
           <div className="grid grid-cols-1 lg:grid-cols-3 gap-6">
             <div className="lg:col-span-1 space-y-4">
               <h2 className="text-[18px] font-semibold text-[#212529] mb-4">
-                Список отчетов ({reports.length})
+                Список отчетов ({reports.length}{nextCursor ? '+' : ''})
               </h2>
               {reports.map((report) => (
                 <Card
@@ -240,6 +249,16 @@ export default function AllReportsPage() {
                   </CardContent>
                 </Card>
               ))}
+              {nextCursor && (
+                <Button
+                  variant="outline"
+                  className="w-full"
+                  onClick={() => fetchReports(nextCursor)}
+                  disabled={loadingMore}
+                >
+                  {loadingMore ? 'Загрузка...' : 'Показать еще'}
+                </Button>
+              )}
             </div>
 
             <div className="lg:col-span-2">
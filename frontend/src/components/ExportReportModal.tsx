@@ -1,11 +1,12 @@
 "use client";
 
-import { useState } from "react";
+import { useRef, useState } from "react";
 import { Dialog, DialogContent, DialogHeader, DialogTitle } from "./ui/dialog";
 import { Button } from "./ui/button";
 import { Input } from "./ui/input";
 import { Textarea } from "./ui/textarea";
 import { Label } from "./ui/label";
+import { waitForReportJob } from "@/utils/api";
 
 interface ExportReportModalProps {
   isOpen: boolean;
@@ -20,6 +21,7 @@ export function ExportReportModal({ isOpen, onClose, onSuccess, projectId }: Exp
   const [format, setFormat] = useState<"csv" | "excel">("excel");
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
+  const exportFrameRef = useRef<HTMLIFrameElement>(null);
 
   const handleSubmit = async () => {
     if (!title.trim()) {
@@ -47,6 +49,10 @@ export function ExportReportModal({ isOpen, onClose, onSuccess, projectId }: Exp
       });
 
       if (response.ok) {
+        const job = await response.json();
+        if (job.status !== "completed") {
+          await waitForReportJob(job.id);
+        }
         setTitle("");
         setDescription("");
         setFormat("excel");
@@ -58,12 +64,72 @@ export function ExportReportModal({ isOpen, onClose, onSuccess, projectId }: Exp
       }
     } catch (error) {
       console.error('Error creating report:', error);
-      setError('Не удалось создать отчет');
+      setError(error instanceof Error ? error.message : 'Не удалось создать отчет');
     } finally {
       setLoading(false);
     }
   };
 
+  const handleExport = async () => {
+    if (!title.trim()) {
+      setError("Введите название отчета");
+      return;
+    }
+
+    setLoading(true);
+    setError(null);
+
+    try {
+      const token = localStorage.getItem('token');
+      const response = await fetch('/api/reports/export', {
+        method: 'POST',
+        headers: {
+          'Authorization': `Bearer ${token}`,
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({
+          project_id: parseInt(projectId),
+          title,
+          description,
+          format
+        }),
+      });
+
+      if (!response.ok) {
+        const errorData = await response.json();
+        setError(errorData.detail || 'Не удалось скачать отчет');
+        return;
+      }
+
+      // Letting the browser fetch the file saves it to disk as it arrives;
+      // fetch would have to hold the whole file in memory first
+      const { ticket } = await response.json();
+      if (exportFrameRef.current) {
+        exportFrameRef.current.src = `/api/reports/export/${encodeURIComponent(ticket)}`;
+      }
+    } catch (error) {
+      console.error('Error exporting report:', error);
+      setError('Не удалось скачать отчет');
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  // Downloads leave the frame empty; it only loads a page when the export failed
+  const handleExportFrameLoad = () => {
+    const text = exportFrameRef.current?.contentDocument?.body?.textContent;
+    if (!text) {
+      return;
+    }
+    try {
+      const errorData = JSON.parse(text);
+      setError(typeof errorData.detail === 'string' ? errorData.detail : 'Не удалось скачать отчет');
+    } catch (error) {
+      console.error('Error exporting report:', error);
+      setError('Не удалось скачать отчет');
+    }
+  };
+
   const handleClose = () => {
     setTitle("");
     setDescription("");
@@ -81,6 +147,13 @@ export function ExportReportModal({ isOpen, onClose, onSuccess, projectId }: Exp
           </DialogTitle>
         </DialogHeader>
 
+        <iframe
+          ref={exportFrameRef}
+          onLoad={handleExportFrameLoad}
+          className="hidden"
+          title="export"
+        />
+
         <div className="space-y-4 py-4">
           {error && (
             <div className="p-3 bg-red-50 border border-red-200 rounded-md">
@@ -158,6 +231,13 @@ export function ExportReportModal({ isOpen, onClose, onSuccess, projectId }: Exp
           >
             Отмена
           </Button>
+          <Button
+            variant="outline"
+            onClick={handleExport}
+            disabled={loading || !title.trim()}
+          >
+            Скачать без сохранения
+          </Button>
           <Button
             onClick={handleSubmit}
             disabled={loading || !title.trim()}
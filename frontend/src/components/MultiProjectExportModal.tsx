@@ -7,6 +7,7 @@ import { Input } from "./ui/input";
 import { Textarea } from "./ui/textarea";
 import { Label } from "./ui/label";
 import { Checkbox } from "./ui/checkbox";
+import { waitForReportJob } from "@/utils/api";
 
 interface Project {
   id: number;
@@ -110,6 +111,10 @@ export function MultiProjectExportModal({ isOpen, onClose, onSuccess }: MultiPro
       });
 
       if (response.ok) {
+        const job = await response.json();
+        if (job.status !== "completed") {
+          await waitForReportJob(job.id);
+        }
         setTitle("");
         setDescription("");
         setFormat("excel");
@@ -122,7 +127,7 @@ export function MultiProjectExportModal({ isOpen, onClose, onSuccess }: MultiPro
       }
     } catch (error) {
       console.error('Error creating report:', error);
-      setError('Не удалось создать отчет');
+      setError(error instanceof Error ? error.message : 'Не удалось создать отчет');
     } finally {
       setLoading(false);
     }
@@ -141,6 +141,17 @@ export function AuthProvider({ children }: { children: ReactNode }) {
   };
 
   const logout = () => {
+    const currentToken = localStorage.getItem('token');
+    if (currentToken) {
+      // Revoke the token server-side; the local session ends either way
+      fetch('/api/auth/logout', {
+        method: 'POST',
+        headers: {
+          'Authorization': `Bearer ${currentToken}`
+        }
+      }).catch(() => {});
+    }
+
     setToken(null);
     setUser(null);
     localStorage.removeItem('token');
@@ -153,3 +153,36 @@ export async function apiUploadFile(endpoint: string, formData: FormData): Promi
 
   return response.json();
 }
+
+/**
+ * Wait until a queued report job finishes.
+ * Throws with the job error if generation failed, or once timeoutMs elapses.
+ */
+export async function waitForReportJob(
+  jobId: number,
+  intervalMs = 1000,
+  timeoutMs = 10 * 60 * 1000
+): Promise<void> {
+  const deadline = Date.now() + timeoutMs;
+
+  while (Date.now() < deadline) {
+    const response = await fetch(`/api/reports/jobs/${jobId}`, {
+      headers: getAuthHeaders(),
+    });
+    if (!response.ok) {
+      throw new Error('Не удалось получить статус отчета');
+    }
+
+    const job = await response.json();
+    if (job.status === 'completed') {
+      return;
+    }
+    if (job.status === 'failed') {
+      throw new Error(job.error || 'Не удалось создать отчет');
+    }
+
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+
+  throw new Error('Отчет формируется слишком долго, проверьте список отчетов позже');
+}